@@ -0,0 +1,347 @@
+"""
+Dungeon Crawler Benchmark
+Times maze generation, level setup, simulation ticks and drawing for every
+map size preset with scripted, reproducible input, and compares the maze
+algorithms' time and peak memory. With a window, cold starts of the game
+(time to first frame and until playable) are timed in fresh processes.
+
+    python benchmark.py --output results.json
+    python benchmark.py --enemies 50,500 --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+from game.constants import MAP_SIZES, TILE_SIZE, FIXED_TIMESTEP, LEADERBOARD_FILE
+from game.highscore import HighscoreManager
+from game.level_cache import LevelCache
+from game.maze_generator import MazeGenerator
+from game.profiler import FrameProfiler
+from game.world import World
+
+# Scripted input: hold each of the 8 directions for this many ticks, and
+# attack every ATTACK_EVERY ticks
+DIRECTIONS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+TICKS_PER_DIRECTION = 30
+ATTACK_EVERY = 20
+
+# Stages compared against a baseline; other stages are nested in these
+COMPARED_STAGES = ('generate', 'cache_load', 'world_setup', 'tick', 'window_setup', 'update', 'draw',
+                   'startup_first_frame', 'startup_playable')
+
+# The game, started by the cold start benchmark
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+
+# Peak memory growth below this is not flagged as a regression
+MIN_MEMORY_DELTA_KB = 64
+
+
+def scripted_input(tick):
+    """
+    Input for one tick of a benchmark run.
+    
+    Returns:
+        (dx, dy, attack)
+    """
+    dx, dy = DIRECTIONS[(tick // TICKS_PER_DIRECTION) % len(DIRECTIONS)]
+    return dx, dy, tick % ATTACK_EVERY == 0
+
+
+def parse_counts(text):
+    """'10,100' -> [10, 100]; 'default' -> [None]."""
+    return [None if part == 'default' else int(part) for part in text.split(',')]
+
+
+def case_name(map_size, coins, enemies):
+    """Key of one benchmark case in the results file."""
+    coins = 'default' if coins is None else coins
+    enemies = 'default' if enemies is None else enemies
+    return f"{map_size}/coins={coins}/enemies={enemies}"
+
+
+def bench_maze(map_size, algorithm, repeat, seed):
+    """
+    Time one maze algorithm and measure its peak memory.
+    
+    Returns:
+        Result entry with the 'generate' stage, 'peak_kb' for a full
+        generate() and, for row-streaming algorithms, 'stream_peak_kb' for
+        consuming the rows without keeping them
+    """
+    map_width, map_height = MAP_SIZES[map_size]
+    start = TILE_SIZE + TILE_SIZE // 2
+    profiler = FrameProfiler(history=repeat)
+    
+    rng = random.Random(seed)
+    for _ in range(repeat):
+        with profiler.stage('generate'):
+            MazeGenerator.generate(map_width, map_height, start, start, rng, algorithm)
+    
+    # Measured separately: tracing slows allocation down
+    tracemalloc.start()
+    MazeGenerator.generate(map_width, map_height, start, start, random.Random(seed), algorithm)
+    result = {'peak_kb': tracemalloc.get_traced_memory()[1] / 1024}
+    if algorithm == 'eller':
+        tracemalloc.reset_peak()
+        for _ in MazeGenerator.eller_rows(map_width, map_height, random.Random(seed)):
+            pass
+        result['stream_peak_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    result['stages'] = profiler.summary()
+    return result
+
+
+def bench_startup(repeat, workdir):
+    """
+    Time cold starts of the game, each in a fresh process.
+    
+    Args:
+        repeat: Number of starts
+        workdir: Working directory for the game's files (leaderboard, level cache)
+    
+    Returns:
+        Result entry with the 'startup_imports', 'startup_first_frame' and
+        'startup_playable' stages
+    """
+    profiler = FrameProfiler(history=repeat)
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, MAIN_SCRIPT, '--time-startup'],
+            cwd=workdir, capture_output=True, text=True, check=True
+        ).stdout
+        # The timings are the last line, in milliseconds
+        for name, ms in json.loads(output.splitlines()[-1]).items():
+            profiler.record(f'startup_{name}', ms / 1000)
+    return {'stages': profiler.summary()}
+
+
+def bench_headless(profiler, map_size, coins, enemies, ticks, repeat, seed, cache_dir):
+    """
+    Time loading the level from the level cache, World.setup and World.step without a window.
+    
+    Returns:
+        (restarts, collider): game restarts, and the TileCollider counters
+        per tick as {counter: {'mean', 'max'}}, which should stay flat as
+        maps grow
+    """
+    world = World(map_size, profiler=profiler, coin_count=coins, enemy_count=enemies, seed=seed)
+    cache = LevelCache(cache_dir)
+    cache.store(world.generate_level())
+    for _ in range(repeat):
+        with profiler.stage('cache_load'):
+            cache.load(map_size, seed, world.algorithm, world.coin_count, world.enemy_count)
+    
+    for _ in range(repeat):
+        with profiler.stage('world_setup'):
+            world.setup()
+    
+    restarts = 0
+    counters = []
+    for tick in range(ticks):
+        if world.game_over:
+            # Keep ticking a live level; setup is not part of the tick timing
+            world.setup()
+            restarts += 1
+        dx, dy, attack = scripted_input(tick)
+        world.set_movement(dx, dy)
+        if attack:
+            world.attack()
+        with profiler.stage('tick'):
+            world.step(FIXED_TIMESTEP)
+        counters.append(world.collider.stats())
+    
+    collider = {
+        name: {'mean': float(np.mean(values)), 'max': int(np.max(values))}
+        for name, values in ((name, [tick[name] for tick in counters]) for name in counters[0])
+    } if counters else {}
+    return restarts, collider
+
+
+def bench_window(window, profiler, map_size, coins, enemies, ticks, repeat, seed):
+    """Time DungeonCrawler.setup, on_update and on_draw."""
+    window.current_map_size = map_size
+    window.world_options = {'coin_count': coins, 'enemy_count': enemies, 'seed': seed}
+    
+    for _ in range(repeat):
+        with profiler.stage('window_setup'):
+            window.setup()
+    
+    restarts = 0
+    for tick in range(ticks):
+        if window.world.game_over:
+            window.setup()
+            restarts += 1
+        dx, dy, attack = scripted_input(tick)
+        window.world.set_movement(dx, dy)
+        if attack:
+            window._attack()
+        window.on_update(FIXED_TIMESTEP)
+        window.on_draw()
+    return restarts
+
+
+def run(args):
+    """Run every case and return the results document."""
+    # Seeded levels go through the level cache and scripted games end on
+    # the leaderboard; keep their files out of the way of the player's
+    cache_dir = tempfile.TemporaryDirectory()
+    window = None
+    if not args.no_window:
+        # Imported here so headless runs do not need a display
+        from main import DungeonCrawler
+        window = DungeonCrawler()
+        window.level_cache = LevelCache(cache_dir.name)
+        window.highscore_manager = HighscoreManager(
+            os.path.join(cache_dir.name, LEADERBOARD_FILE),
+            legacy_filename=os.path.join(cache_dir.name, "highscores.json")
+        )
+        window.wait_for_assets()
+    
+    results = {}
+    if window:
+        results['startup'] = bench_startup(args.repeat, cache_dir.name)
+        stages = results['startup']['stages']
+        print(f"startup: first frame p50 {stages['startup_first_frame']['p50']:.0f} ms  "
+              f"playable p50 {stages['startup_playable']['p50']:.0f} ms")
+    
+    for map_size in args.sizes:
+        for algorithm in args.algorithms:
+            name = f"maze/{map_size}/{algorithm}"
+            results[name] = bench_maze(map_size, algorithm, args.repeat, args.seed)
+            generate = results[name]['stages']['generate']
+            print(f"{name}: generate p50 {generate['p50']:.3f} ms  peak {results[name]['peak_kb']:.0f} KB"
+                  + (f"  streaming peak {results[name]['stream_peak_kb']:.0f} KB"
+                     if 'stream_peak_kb' in results[name] else ""))
+        
+        for coins in args.coins:
+            for enemies in args.enemies:
+                name = case_name(map_size, coins, enemies)
+                profiler = FrameProfiler(history=max(args.ticks, args.repeat))
+                restarts, collider = bench_headless(profiler, map_size, coins, enemies,
+                                                    args.ticks, args.repeat, args.seed, cache_dir.name)
+                if window:
+                    # The window records update/draw stages into its own profiler
+                    window.profiler = profiler
+                    restarts += bench_window(window, profiler, map_size, coins, enemies,
+                                             args.ticks, args.repeat, args.seed)
+                results[name] = {'restarts': restarts, 'collider': collider, 'stages': profiler.summary()}
+                
+                tick = results[name]['stages']['tick']
+                print(f"{name}: tick p50 {tick['p50']:.3f} ms  p95 {tick['p95']:.3f} ms  "
+                      f"tiles checked/tick {collider['tiles_checked']['mean']:.0f}")
+    
+    if window:
+        window.close()
+    cache_dir.cleanup()
+    
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'ticks': args.ticks,
+            'repeat': args.repeat,
+            'window': window is not None,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold, min_delta):
+    """
+    Find stages whose median got slower, or peak memory larger, than the baseline.
+    
+    A stage regresses when its p50 grew by more than `threshold` (a
+    fraction) and by more than `min_delta` milliseconds, so sub-noise
+    changes on tiny stages are not flagged. Peak memory uses the same
+    threshold and MIN_MEMORY_DELTA_KB.
+    
+    Returns:
+        List of (case, stage, baseline, current) in ms or KB
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        for stage in COMPARED_STAGES:
+            if stage not in result['stages'] or stage not in old['stages']:
+                continue
+            before = old['stages'][stage]['p50']
+            after = result['stages'][stage]['p50']
+            if after > before * (1 + threshold) and after - before > min_delta:
+                regressions.append((name, stage, before, after))
+        for metric in ('peak_kb', 'stream_peak_kb'):
+            if metric in result and metric in old:
+                before, after = old[metric], result[metric]
+                if after > before * (1 + threshold) and after - before > MIN_MEMORY_DELTA_KB:
+                    regressions.append((name, metric, before, after))
+    return regressions
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the dungeon crawler")
+    parser.add_argument('--sizes', default=','.join(MAP_SIZES),
+                        help="Comma-separated map size presets (default: all)")
+    parser.add_argument('--coins', default='default',
+                        help="Comma-separated coin counts, or 'default'")
+    parser.add_argument('--enemies', default='default',
+                        help="Comma-separated enemy counts, or 'default'")
+    parser.add_argument('--algorithms', default=','.join(MazeGenerator.ALGORITHMS),
+                        help="Comma-separated maze algorithms to compare (default: all)")
+    parser.add_argument('--ticks', type=int, default=600, help="Simulation ticks per case")
+    parser.add_argument('--repeat', type=int, default=10, help="Runs of generate/setup per case")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed for reproducible levels")
+    parser.add_argument('--no-window', action='store_true',
+                        help="Skip the window stages (setup, update, draw)")
+    parser.add_argument('--output', default='benchmark.json', help="Where to write the results")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Results file to compare against; exits with 1 on regressions")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Allowed p50 slowdown as a fraction (default 0.15)")
+    parser.add_argument('--min-delta', type=float, default=0.05,
+                        help="Ignore slowdowns smaller than this many ms (default 0.05)")
+    args = parser.parse_args()
+    
+    args.sizes = args.sizes.split(',')
+    for map_size in args.sizes:
+        if map_size not in MAP_SIZES:
+            parser.error(f"unknown map size {map_size!r} (choose from {', '.join(MAP_SIZES)})")
+    args.algorithms = args.algorithms.split(',')
+    for algorithm in args.algorithms:
+        if algorithm not in MazeGenerator.ALGORITHMS:
+            parser.error(f"unknown maze algorithm {algorithm!r} "
+                         f"(choose from {', '.join(MazeGenerator.ALGORITHMS)})")
+    args.coins = parse_counts(args.coins)
+    args.enemies = parse_counts(args.enemies)
+    
+    current = run(args)
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.output}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.min_delta)
+        for name, stage, before, after in regressions:
+            unit = 'KB' if stage.endswith('_kb') else 'ms'
+            print(f"REGRESSION {name} {stage}: {before:.3f} {unit} -> {after:.3f} {unit} "
+                  f"(+{(after / before - 1) * 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Chunked World Regions"""
+import math
+
+import numpy as np
+
+from .constants import CHUNK_SIZE
+
+
+class ChunkGrid:
+    """
+    Splits the map into square chunks of chunk_size pixels.
+    
+    Chunks decide what is worth drawing each frame: walls are baked and
+    coins grouped per chunk, and only the chunks in the camera view are
+    drawn. (Enemy AI works by distance instead, see AI_LOD_TIERS.)
+    """
+    
+    def __init__(self, map_width, map_height, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        # Border walls are centered on the map edges, so count them in
+        self.cols = map_width // chunk_size + 1
+        self.rows = map_height // chunk_size + 1
+    
+    def chunk_of(self, x, y):
+        """(col, row) of the chunk containing a pixel position, clamped to the map."""
+        col = min(max(math.floor(x / self.chunk_size), 0), self.cols - 1)
+        row = min(max(math.floor(y / self.chunk_size), 0), self.rows - 1)
+        return col, row
+    
+    def chunks_of(self, xs, ys):
+        """Vectorized chunk_of(): (cols, rows) integer arrays."""
+        size = self.chunk_size
+        cols = np.clip(np.floor(np.asarray(xs) / size), 0, self.cols - 1).astype(np.intp)
+        rows = np.clip(np.floor(np.asarray(ys) / size), 0, self.rows - 1).astype(np.intp)
+        return cols, rows
+    
+    def chunks_in_rect(self, left, bottom, right, top):
+        """Chunks overlapping a pixel rectangle (e.g. the camera view)."""
+        min_col, min_row = self.chunk_of(left, bottom)
+        max_col, max_row = self.chunk_of(right, top)
+        return [
+            (c, r)
+            for r in range(min_row, max_row + 1)
+            for c in range(min_col, max_col + 1)
+        ]
@@ -0,0 +1,179 @@
+"""Tile-Grid Collision Resolution"""
+import numpy as np
+
+# Keeps boxes that only touch a tile edge from counting as overlapping
+EDGE_EPSILON = 1e-6
+
+
+class TileCollider:
+    """
+    Resolves movement against the Maze grid instead of a list of wall sprites.
+    
+    Only the 3x3 tiles around a mover are tested, so the cost of a move does
+    not depend on how many walls the map has. The border walls around the
+    play area are handled as clamping bounds.
+    """
+    
+    def __init__(self, maze, bounds):
+        """
+        Args:
+            maze: Maze from MazeGenerator.generate
+            bounds: (left, bottom, right, top) of the walkable area in pixels
+        """
+        self.maze = maze
+        self.min_x, self.min_y, self.max_x, self.max_y = bounds
+        
+        # Per-tick counters (see reset_counters)
+        self.moves = 0
+        self.tiles_checked = 0
+        self.collisions = 0
+    
+    def reset_counters(self):
+        """Start counting a new tick."""
+        self.moves = 0
+        self.tiles_checked = 0
+        self.collisions = 0
+    
+    def stats(self):
+        """Counters for the current tick."""
+        return {
+            'moves': self.moves,
+            'tiles_checked': self.tiles_checked,
+            'collisions': self.collisions,
+        }
+    
+    def _walls_hit(self, body):
+        """Centers of wall tiles in the 3x3 neighbourhood overlapping the body."""
+        maze = self.maze
+        cells, width, height = maze.cells, maze.width, maze.height
+        size = maze.tile_size
+        col, row = maze.cell_at(body.center_x, body.center_y)
+        self.tiles_checked += 9
+        
+        hits = []
+        for r in range(max(row - 1, 0), min(row + 2, height)):
+            for c in range(max(col - 1, 0), min(col + 2, width)):
+                if not cells[r * width + c]:
+                    continue
+                tx = maze.offset_x + c * size
+                ty = maze.offset_y + r * size
+                if (abs(body.center_x - tx) * 2 < body.width + size and
+                        abs(body.center_y - ty) * 2 < body.height + size):
+                    hits.append((tx, ty))
+        return hits
+    
+    def move(self, body):
+        """
+        Move a body by its velocity, one axis at a time, stopping flush at walls.
+        
+        Returns:
+            Number of collisions resolved during this move
+        """
+        half = self.maze.tile_size / 2
+        hits = 0
+        self.moves += 1
+        
+        if body.change_x:
+            body.center_x += body.change_x
+            walls = self._walls_hit(body)
+            if walls:
+                hits += 1
+                if body.change_x > 0:
+                    body.center_x = min(tx for tx, _ in walls) - half - body.width / 2
+                else:
+                    body.center_x = max(tx for tx, _ in walls) + half + body.width / 2
+            if body.left < self.min_x:
+                hits += 1
+                body.center_x = self.min_x + body.width / 2
+            elif body.right > self.max_x:
+                hits += 1
+                body.center_x = self.max_x - body.width / 2
+        
+        if body.change_y:
+            body.center_y += body.change_y
+            walls = self._walls_hit(body)
+            if walls:
+                hits += 1
+                if body.change_y > 0:
+                    body.center_y = min(ty for _, ty in walls) - half - body.height / 2
+                else:
+                    body.center_y = max(ty for _, ty in walls) + half + body.height / 2
+            if body.bottom < self.min_y:
+                hits += 1
+                body.center_y = self.min_y + body.height / 2
+            elif body.top > self.max_y:
+                hits += 1
+                body.center_y = self.max_y - body.height / 2
+        
+        self.collisions += hits
+        return hits
+    
+    def _solid(self, cols, rows):
+        """Vectorized wall lookup; cells outside the maze are open floor."""
+        maze = self.maze
+        cells = np.frombuffer(maze.cells, dtype=np.uint8)
+        inside = (cols >= 0) & (cols < maze.width) & (rows >= 0) & (rows < maze.height)
+        index = np.where(inside, rows * maze.width + cols, 0)
+        return inside & (cells[index] == 1)
+    
+    def move_many(self, store, width, height, slots=None):
+        """
+        Batched move() for bodies in an EnemyStore.
+        
+        Bodies are smaller than a tile, so on each axis only the two cells
+        under the leading edge can block them.
+        
+        Args:
+            slots: Slots to move (default: every body in the store)
+        
+        Returns:
+            Number of collisions resolved
+        """
+        if slots is None:
+            slots = np.arange(store.count)
+        n = len(slots)
+        if not n:
+            return 0
+        
+        maze = self.maze
+        size = maze.tile_size
+        half = size / 2
+        half_w, half_h = width / 2, height / 2
+        x, y = store.x[slots], store.y[slots]
+        change_x, change_y = store.change_x[slots], store.change_y[slots]
+        self.moves += n
+        self.tiles_checked += 4 * n
+        hits = 0
+        
+        # X axis
+        x += change_x
+        lead = np.where(change_x > 0, x + half_w - EDGE_EPSILON, x - half_w + EDGE_EPSILON)
+        cols = np.floor((lead - maze.offset_x + half) / size).astype(np.intp)
+        row_low = np.floor((y - half_h + EDGE_EPSILON - maze.offset_y + half) / size).astype(np.intp)
+        row_high = np.floor((y + half_h - EDGE_EPSILON - maze.offset_y + half) / size).astype(np.intp)
+        blocked = (change_x != 0) & (self._solid(cols, row_low) | self._solid(cols, row_high))
+        tile_x = maze.offset_x + cols * size
+        x[:] = np.where(blocked & (change_x > 0), tile_x - half - half_w, x)
+        x[:] = np.where(blocked & (change_x < 0), tile_x + half + half_w, x)
+        outside = (x < self.min_x + half_w) | (x > self.max_x - half_w)
+        np.clip(x, self.min_x + half_w, self.max_x - half_w, out=x)
+        hits += int(np.count_nonzero(blocked)) + int(np.count_nonzero(outside))
+        
+        # Y axis
+        y += change_y
+        lead = np.where(change_y > 0, y + half_h - EDGE_EPSILON, y - half_h + EDGE_EPSILON)
+        rows = np.floor((lead - maze.offset_y + half) / size).astype(np.intp)
+        col_low = np.floor((x - half_w + EDGE_EPSILON - maze.offset_x + half) / size).astype(np.intp)
+        col_high = np.floor((x + half_w - EDGE_EPSILON - maze.offset_x + half) / size).astype(np.intp)
+        blocked = (change_y != 0) & (self._solid(col_low, rows) | self._solid(col_high, rows))
+        tile_y = maze.offset_y + rows * size
+        y[:] = np.where(blocked & (change_y > 0), tile_y - half - half_h, y)
+        y[:] = np.where(blocked & (change_y < 0), tile_y + half + half_h, y)
+        outside = (y < self.min_y + half_h) | (y > self.max_y - half_h)
+        np.clip(y, self.min_y + half_h, self.max_y - half_h, out=y)
+        hits += int(np.count_nonzero(blocked)) + int(np.count_nonzero(outside))
+        
+        store.x[slots] = x
+        store.y[slots] = y
+        self.collisions += hits
+        return hits
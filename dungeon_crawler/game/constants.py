@@ -6,15 +6,83 @@ SCREEN_HEIGHT = 600
 SCREEN_TITLE = "Dungeon Crawler"
 TILE_SIZE = 64
 
-# Gameplay constants
+# Asset paths
+PLAYER_CHARACTER = ":resources:images/animated_characters/female_person/femalePerson"
+ENEMY_CHARACTER = ":resources:images/animated_characters/zombie/zombie"
+COIN_TEXTURE = ":resources:images/items/coinGold.png"
+WALL_TEXTURE = ":resources:images/tiles/grassCenter.png"
+
+# Fixed simulation rate (steps per second). Frames run as many whole steps
+# as the elapsed time covers, at most MAX_STEPS_PER_FRAME; a slower frame
+# drops the rest instead of slowing the game down.
+SIMULATION_RATE = 60
+FIXED_TIMESTEP = 1 / SIMULATION_RATE
+MAX_STEPS_PER_FRAME = 5
+
+# Window updates and draws per second: while playing or loading, and on
+# static screens (menus, pause, game over), which are only redrawn when
+# input or a state change alters them
+FRAME_RATE = 60
+IDLE_FRAME_RATE = 20
+
+# Gameplay constants (speeds in pixels per step at 60 steps per second)
 PLAYER_SPEED = 5
 ENEMY_SPEED = 2
+SPEED_SCALE = 60 / SIMULATION_RATE
 PLAYER_HEALTH = 100
 ENEMY_HEALTH = 50
 ATTACK_DAMAGE = 25
 ATTACK_COOLDOWN = 0.5  # seconds
 UPDATES_PER_FRAME = 7  # How many updates before we advance a frame
 
+# Bake walls into one pre-rendered texture per chunk (False = one sprite per wall)
+STATIC_WALL_LAYER = True
+
+# Chunks next to the view the wall layer bakes ahead per frame (chunks
+# in view are always baked at once)
+WALL_BAKES_PER_FRAME = 1
+
+# Maze generator: 'backtracker' (recursive backtracker) or 'eller'
+# (Eller's algorithm, generated row by row in O(width) memory)
+MAZE_ALGORITHM = 'backtracker'
+
+# Levels generated ahead of time in worker processes (0 = generate on restart)
+PREGENERATE_LEVELS = 2
+
+# Levels played from a fixed seed are kept on disk; the least recently
+# used are deleted once the directory grows past the budget (bytes)
+LEVEL_CACHE_DIR = "level_cache"
+LEVEL_CACHE_BUDGET = 64 * 1024 * 1024
+
+# World chunks (pixels per side), the unit of wall baking and coin drawing
+CHUNK_SIZE = 16 * TILE_SIZE
+
+# Enemy AI level of detail: (distance, interval) tiers. Enemies within
+# `distance` pixels of the player (on either axis) think and move once
+# every `interval` ticks, spread over the ticks; enemies beyond the last
+# tier stay dormant. The first tier runs every tick and must cover the
+# camera view.
+AI_LOD_TIERS = ((CHUNK_SIZE, 1), (2 * CHUNK_SIZE, 4))
+# Most enemy updates per tick outside the every-tick tier; the longest
+# waiting go first. A count, not a time, so seeded replays stay exact.
+AI_UPDATE_BUDGET = 256
+
+# Leaderboard database, and entries per page of the highscore screen
+LEADERBOARD_FILE = "highscores.db"
+LEADERBOARD_PAGE_SIZE = 8
+# Ranks that count as a high score
+MAX_SCORES = 10
+
+# Frame profiler: samples kept per stage, and where timings go on exit
+# (.json for raw samples, anything else for a CSV summary; None = don't save)
+PROFILE_HISTORY = 600
+PROFILE_EXPORT = "frame_profile.csv"
+
+# Collision boxes for the headless simulation (width, height in pixels)
+PLAYER_HITBOX = (28, 40)
+ENEMY_HITBOX = (28, 40)
+COIN_HITBOX = (32, 32)
+
 # Game States
 STATE_MENU = 0
 STATE_SETTINGS = 1
@@ -23,6 +91,9 @@ STATE_PLAYING = 3
 STATE_PAUSED = 4
 STATE_GAME_OVER = 5
 STATE_MAP_SIZE = 6
+STATE_LOADING = 7
+# States whose screen only changes on input, drawn from the screen cache
+STATIC_STATES = (STATE_MENU, STATE_SETTINGS, STATE_HIGHSCORE, STATE_MAP_SIZE, STATE_PAUSED, STATE_GAME_OVER)
 
 # Direction constants for 8-way movement
 RIGHT_FACING = 0
@@ -38,12 +109,23 @@ DIRECTION_UP_LEFT = 6
 DIRECTION_DOWN_RIGHT = 7
 DIRECTION_DOWN_LEFT = 8
 
-# Map size presets (width, height in tiles)
+# Map size presets (width, height in pixels); the window stays
+# SCREEN_WIDTH x SCREEN_HEIGHT and the camera scrolls over larger maps
 MAP_SIZES = {
     'small': (800, 600),
     'medium': (1200, 900),
     'large': (1600, 1200),
-    'huge': (2000, 1500)
+    'huge': (2000, 1500),
+    'giant': (20000, 15000)
+}
+
+# Coins and enemies per level for each preset (coins, enemies)
+ENTITY_COUNTS = {
+    'small': (30, 11),
+    'medium': (25, 9),
+    'large': (20, 7),
+    'huge': (15, 5),
+    'giant': (1500, 500)
 }
 
 DEFAULT_MAP_SIZE = 'small'
@@ -0,0 +1,193 @@
+"""Struct-of-Arrays Enemy Storage"""
+import numpy as np
+
+from .constants import ENEMY_HEALTH, ENEMY_HITBOX
+from .spatial import SpatialGrid
+
+
+def _column(name, indexed=False):
+    """
+    Property reading and writing one enemy's row of a store array.
+    
+    Position columns are indexed: setting them keeps the store's spatial
+    index in step.
+    """
+    def get(self):
+        return float(getattr(self.store, name)[self.slot])
+    
+    def set(self, value):
+        getattr(self.store, name)[self.slot] = value
+        if indexed:
+            self.store.reindex_slot(self.slot)
+    
+    return property(get, set)
+
+
+class Enemy:
+    """
+    Handle to one enemy's row in an EnemyStore.
+    
+    Reads and writes go straight to the store's arrays, so code that works
+    on single enemies (placement, drawing) sees the same state as the
+    batched update. The handle is also the enemy's key in the spatial
+    index and in the renderer, so its slot is the only bookkeeping.
+    """
+    
+    __slots__ = ('store', 'slot')
+    
+    width, height = ENEMY_HITBOX
+    
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+    
+    center_x = _column('x', indexed=True)
+    center_y = _column('y', indexed=True)
+    change_x = _column('change_x')
+    change_y = _column('change_y')
+    health = _column('health')
+
+
+class EnemyStore:
+    """
+    All enemies as contiguous NumPy arrays (positions, velocities, health).
+    
+    Live enemies occupy slots 0..count-1. Removing an enemy moves the last
+    one into its slot, so removal is O(1) and the arrays stay packed for
+    batched updates. A SpatialGrid keyed by tile answers radius queries.
+    """
+    
+    # Per-enemy arrays and their types
+    COLUMNS = {
+        'x': np.float64,
+        'y': np.float64,
+        'change_x': np.float64,
+        'change_y': np.float64,
+        'health': np.float64,
+        'cell_col': np.intp,
+        'cell_row': np.intp,
+        'ai_tick': np.int64,
+    }
+    
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.records = []
+        self.index = SpatialGrid()
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity):
+        """Grow the arrays, keeping the live rows."""
+        for name, dtype in self.COLUMNS.items():
+            grown = np.zeros(capacity, dtype=dtype)
+            if hasattr(self, name):
+                grown[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, grown)
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return iter(list(self.records))
+    
+    def __contains__(self, enemy):
+        return enemy.store is self and enemy.slot >= 0
+    
+    def add(self, center_x, center_y, health=ENEMY_HEALTH):
+        """Spawn an enemy and return its handle."""
+        if self.count == len(self.x):
+            self._allocate(len(self.x) * 2)
+        slot = self.count
+        self.x[slot] = center_x
+        self.y[slot] = center_y
+        self.change_x[slot] = 0.0
+        self.change_y[slot] = 0.0
+        self.health[slot] = health
+        self.ai_tick[slot] = 0
+        self.count += 1
+        
+        enemy = Enemy(self, slot)
+        self.records.append(enemy)
+        self.index.insert(enemy, center_x, center_y)
+        self.cell_col[slot], self.cell_row[slot] = self.index.cells[enemy]
+        return enemy
+    
+    def remove(self, enemy):
+        """Remove an enemy in O(1) by moving the last row into its slot."""
+        slot = enemy.slot
+        last = self.count - 1
+        self.index.remove(enemy)
+        if slot != last:
+            for name in self.COLUMNS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+            moved = self.records[last]
+            moved.slot = slot
+            self.records[slot] = moved
+        self.records.pop()
+        self.count -= 1
+        enemy.slot = -1
+    
+    def steer(self, target_x, target_y, speed, slots=None):
+        """
+        Point enemies' velocities at their targets, keeping them when already there.
+        
+        Args:
+            target_x, target_y: Target arrays, one entry per steered enemy
+            speed: Pixels per tick, or an array with one entry per steered enemy
+            slots: Slots to steer (default: every enemy)
+        """
+        if slots is None:
+            slots = slice(0, self.count)
+        dx = target_x - self.x[slots]
+        dy = target_y - self.y[slots]
+        distance = np.hypot(dx, dy)
+        moving = distance > 0
+        safe = np.where(moving, distance, 1.0)
+        self.change_x[slots] = np.where(moving, dx / safe * speed, self.change_x[slots])
+        self.change_y[slots] = np.where(moving, dy / safe * speed, self.change_y[slots])
+    
+    def reindex(self):
+        """Rebucket enemies that crossed into another tile since the last call."""
+        n = self.count
+        size = self.index.cell_size
+        cols = np.floor(self.x[:n] / size).astype(np.intp)
+        rows = np.floor(self.y[:n] / size).astype(np.intp)
+        changed = np.flatnonzero((cols != self.cell_col[:n]) | (rows != self.cell_row[:n]))
+        for slot in changed:
+            self.index.move(self.records[slot], self.x[slot], self.y[slot])
+        self.cell_col[:n] = cols
+        self.cell_row[:n] = rows
+    
+    def reindex_slot(self, slot):
+        """Rebucket a single enemy after its position was set directly."""
+        enemy = self.records[slot]
+        self.index.move(enemy, self.x[slot], self.y[slot])
+        self.cell_col[slot], self.cell_row[slot] = self.index.cells[enemy]
+    
+    def within(self, x, y, radius):
+        """Slots of enemies whose centers are closer than radius to (x, y)."""
+        candidates = self.index.query(x, y, radius)
+        slots = np.fromiter((enemy.slot for enemy in candidates), dtype=np.intp, count=len(candidates))
+        return slots[np.hypot(self.x[slots] - x, self.y[slots] - y) < radius]
+    
+    def damage(self, slots, amount):
+        """
+        Apply damage to the given slots and remove enemies that died.
+        
+        Returns:
+            Handles of the killed enemies
+        """
+        self.health[slots] -= amount
+        dead = slots[self.health[slots] <= 0]
+        killed = [self.records[slot] for slot in dead]
+        for enemy in killed:
+            self.remove(enemy)
+        return killed
+    
+    def count_overlapping(self, body):
+        """Number of enemies whose boxes overlap the body's box."""
+        n = self.count
+        return int(np.count_nonzero(
+            (np.abs(self.x[:n] - body.center_x) * 2 < Enemy.width + body.width) &
+            (np.abs(self.y[:n] - body.center_y) * 2 < Enemy.height + body.height)
+        ))
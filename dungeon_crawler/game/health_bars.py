@@ -0,0 +1,77 @@
+"""Batched Enemy Health Bars"""
+import arcade
+import numpy as np
+
+from .constants import ENEMY_HEALTH
+
+BAR_WIDTH = 40
+BAR_HEIGHT = 5
+BAR_OFFSET_Y = 40
+
+
+class HealthBarLayer:
+    """
+    Enemy health bars as two solid-color sprites per enemy in one SpriteList.
+    
+    Drawing costs a single batched call however many enemies there are.
+    sync() compares the enemy arrays with what was drawn last time and only
+    moves or resizes the bars of enemies that moved or took damage.
+    """
+    
+    def __init__(self):
+        self.sprite_list = arcade.SpriteList()
+        self.bars = {}
+        # Position and health each slot was last drawn with
+        self._drawn = np.full((3, 0), np.nan)
+        self.updates = 0  # Bars moved or resized, for profiling
+    
+    def add(self, enemy):
+        """Create the bar sprites for a new enemy."""
+        background = arcade.SpriteSolidColor(BAR_WIDTH, BAR_HEIGHT, color=arcade.color.RED)
+        foreground = arcade.SpriteSolidColor(BAR_WIDTH, BAR_HEIGHT, color=arcade.color.GREEN)
+        self.sprite_list.append(background)
+        self.sprite_list.append(foreground)
+        self.bars[enemy] = (background, foreground)
+    
+    def remove(self, enemy):
+        """Drop the bars of a killed enemy."""
+        bars = self.bars.pop(enemy, None)
+        if bars:
+            for sprite in bars:
+                sprite.remove_from_sprite_lists()
+    
+    def clear(self):
+        """Remove every bar (new level)."""
+        self.sprite_list.clear()
+        self.bars = {}
+        self._drawn = np.full((3, 0), np.nan)
+    
+    def sync(self, enemies, xs, ys):
+        """
+        Update the bars of enemies that moved or changed health since the last sync.
+        
+        Args:
+            enemies: EnemyStore
+            xs, ys: Drawn enemy positions by slot
+        """
+        n = enemies.count
+        if self._drawn.shape[1] < n:
+            self._drawn = np.full((3, max(n, 2 * self._drawn.shape[1])), np.nan)
+        
+        current = np.stack((xs, ys, enemies.health[:n]))
+        drawn = self._drawn[:, :n]
+        changed = np.flatnonzero((current != drawn).any(axis=0))
+        drawn[:, changed] = current[:, changed]
+        
+        for slot in changed:
+            x, y, health = current[:, slot]
+            background, foreground = self.bars[enemies.records[slot]]
+            width = BAR_WIDTH * max(health, 0) / ENEMY_HEALTH
+            background.position = (x, y + BAR_OFFSET_Y)
+            foreground.width = width
+            foreground.position = (x - BAR_WIDTH / 2 + width / 2, y + BAR_OFFSET_Y)
+        self.updates += len(changed)
+    
+    def draw(self):
+        """Draw all bars in one call."""
+        self.sprite_list.draw()
@@ -1,47 +1,164 @@
 """Highscore Management with Persistence"""
 import json
 import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+from .constants import LEADERBOARD_FILE
+from .leaderboard import Leaderboard, Score
+
+# Version of the leaderboard once old highscore files are imported
+SCHEMA_VERSION = 1
+
+# Queued to stop the writer thread
+_STOP = object()
 
 
 class HighscoreManager:
-    """Manages highscores with file persistence."""
+    """
+    Manages highscores with file persistence.
     
-    def __init__(self, filename="highscores.json"):
+    Scores live in a Leaderboard (SQLite), one entry per finished game with
+    its map size, seed and duration. New scores are written by a background
+    thread; the game asks for pages and ranks through request_page() and
+    request_standing(), which run on that thread too, so a slow disk or a
+    write from another instance never stalls a frame. The game thread only
+    opens the leaderboard to import old highscore files. SQLite commits
+    atomically and locks the file, so several game instances can share it.
+    """
+    
+    def __init__(self, filename=LEADERBOARD_FILE, legacy_filename="highscores.json"):
         self.filename = filename
-        self.highscores = []
-        self.load()
-    
-    def load(self):
-        """Load highscores from file."""
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r') as f:
-                    self.highscores = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                self.highscores = [100, 80, 50, 30, 10]  # Default scores
-        else:
-            self.highscores = [100, 80, 50, 30, 10]  # Default scores
-    
-    def save(self):
-        """Save highscores to file."""
+        leaderboard = Leaderboard(filename)
+        try:
+            if leaderboard.version < SCHEMA_VERSION:
+                self._import_legacy(leaderboard, legacy_filename)
+        finally:
+            leaderboard.close()
+        
+        self.writes = queue.Queue()
+        self.writer = None
+    
+    @staticmethod
+    def _import_legacy(leaderboard, legacy_filename):
+        """Move scores from the old JSON snapshot and score log into the leaderboard."""
+        scores = []
+        try:
+            with open(legacy_filename, 'r') as f:
+                scores.extend(int(score) for score in json.load(f))
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, IOError, TypeError, ValueError) as e:
+            print(f"Warning: Could not import highscores: {e}")
+        
+        log_filename = os.path.splitext(legacy_filename)[0] + ".log"
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.highscores, f, indent=2)
+            with open(log_filename, 'r') as f:
+                scores.extend(int(line) for line in f.read().splitlines() if line.strip().isdigit())
+        except FileNotFoundError:
+            pass
         except IOError as e:
-            print(f"Warning: Could not save highscores: {e}")
+            print(f"Warning: Could not import score log: {e}")
+        
+        # The old list did not record map sizes
+        leaderboard.add_many([Score(score, None, None, None, None) for score in scores])
+        with leaderboard.connection:
+            leaderboard.version = SCHEMA_VERSION
     
-    def add_score(self, score):
-        """Add a new score and save."""
+    def add_score(self, score, map_size=None, seed=None, duration=None):
+        """Add a new score; it is written to disk in the background."""
         if score > 0:
-            self.highscores.append(score)
-            self.highscores.sort(reverse=True)
-            self.highscores = self.highscores[:10]  # Keep top 10
-            self.save()
-    
-    def get_top_scores(self, n=10):
-        """Get top N scores."""
-        return self.highscores[:n]
-    
-    def is_high_score(self, score):
-        """Check if score qualifies as a highscore."""
-        return len(self.highscores) < 10 or score > min(self.highscores)
+            self._submit(Score(score, map_size, seed, duration, None))
+    
+    def request_page(self, map_size, page, per_page):
+        """page() on the writer thread; returns a Future of its result."""
+        return self._request(self._page, map_size, page, per_page)
+    
+    def request_standing(self, score, map_size=None):
+        """
+        (rank, percentile) of a score, computed on the writer thread.
+        
+        Requests and writes run in order, so a score added after the
+        request is not counted.
+        
+        Returns:
+            Future of (rank, percentile)
+        """
+        return self._request(self._standing, score, map_size)
+    
+    def _request(self, query, *args):
+        """Queue query(leaderboard, *args) for the writer thread."""
+        future = Future()
+        self._submit((future, query, args))
+        return future
+    
+    def _submit(self, entry):
+        """Queue a Score or a query for the writer thread."""
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._write_loop, name="highscore-writer", daemon=True)
+            self.writer.start()
+        self.writes.put(entry)
+    
+    def _write_loop(self):
+        """Background thread: insert queued scores, batching whatever has piled up, and answer queries."""
+        # SQLite connections belong to the thread that opened them
+        leaderboard = Leaderboard(self.filename)
+        stop = False
+        while not stop:
+            jobs = [self.writes.get()]
+            while not self.writes.empty():
+                jobs.append(self.writes.get_nowait())
+            if jobs[-1] is _STOP:
+                jobs.pop()
+                stop = True
+            
+            entries = []
+            for job in jobs:
+                if isinstance(job, Score):
+                    entries.append(job)
+                    continue
+                # Scores queued before a query count for it
+                self._save(leaderboard, entries)
+                entries = []
+                future, query, args = job
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(query(leaderboard, *args))
+                    except sqlite3.Error as e:
+                        future.set_exception(e)
+            self._save(leaderboard, entries)
+        leaderboard.close()
+    
+    @staticmethod
+    def _save(leaderboard, entries):
+        """Insert Score entries in one transaction."""
+        try:
+            if entries:
+                leaderboard.add_many(entries)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not save highscores: {e}")
+    
+    def close(self):
+        """Finish pending writes and stop the writer."""
+        if self.writer is not None:
+            self.writes.put(_STOP)
+            self.writer.join()
+            self.writer = None
+    
+    @staticmethod
+    def _page(leaderboard, map_size, page, per_page):
+        """
+        One page of the leaderboard for a map size (None = all sizes).
+        
+        Returns:
+            (entries, page_count), entries as Score best first
+        """
+        count = leaderboard.count(map_size)
+        return leaderboard.top(map_size, per_page, page * per_page), max(1, -(-count // per_page))
+    
+    @staticmethod
+    def _standing(leaderboard, score, map_size):
+        """1-based rank of a score and the percentage of games scoring at most as much."""
+        return leaderboard.rank(score, map_size), leaderboard.percentile(score, map_size)
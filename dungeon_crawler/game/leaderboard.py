@@ -0,0 +1,125 @@
+"""Leaderboard Storage (SQLite)"""
+import sqlite3
+import time
+from collections import namedtuple
+
+from .constants import LEADERBOARD_FILE
+
+# One finished game. map_size is None for scores imported from the old
+# highscore list, which did not record it.
+Score = namedtuple('Score', 'score map_size seed duration created')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    map_size TEXT,
+    seed INTEGER,
+    duration REAL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_size ON scores (map_size, score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC);
+"""
+
+# Seconds a query waits while another instance is writing
+BUSY_TIMEOUT = 5.0
+
+
+class Leaderboard:
+    """
+    Scores of every finished game in a local SQLite database.
+    
+    Entries are indexed by (map_size, score), so top-N pages walk the index
+    in order and ranks and percentiles count an index range instead of
+    scanning the whole table.
+    Pass map_size=None to query every map size at once. SQLite commits
+    atomically and locks the file, so several game instances can share it;
+    in write-ahead log mode they keep reading while another one writes.
+    
+    A connection belongs to the thread that opened it.
+    """
+    
+    def __init__(self, filename=LEADERBOARD_FILE):
+        self.filename = filename
+        self.connection = sqlite3.connect(filename, timeout=BUSY_TIMEOUT)
+        # Readers and the writer do not block each other
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+    
+    @property
+    def version(self):
+        """Schema version stored in the file (0 = freshly created)."""
+        return self.connection.execute("PRAGMA user_version").fetchone()[0]
+    
+    @version.setter
+    def version(self, value):
+        self.connection.execute(f"PRAGMA user_version = {int(value)}")
+    
+    def add(self, score, map_size=None, seed=None, duration=None, created=None):
+        """Record one finished game."""
+        self.add_many([Score(score, map_size, seed, duration, created)])
+    
+    def add_many(self, scores):
+        """Record several Score entries in one transaction."""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO scores (score, map_size, seed, duration, created) VALUES (?, ?, ?, ?, ?)",
+                [(s.score, s.map_size, s.seed, s.duration, now if s.created is None else s.created)
+                 for s in scores]
+            )
+    
+    @staticmethod
+    def _where(map_size, condition=""):
+        """WHERE clause and parameters selecting one map size (None = all)."""
+        clauses = [condition] if condition else []
+        params = []
+        if map_size is not None:
+            clauses.append("map_size = ?")
+            params.append(map_size)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+    
+    def count(self, map_size=None):
+        """Number of recorded games."""
+        where, params = self._where(map_size)
+        return self.connection.execute(f"SELECT COUNT(*) FROM scores{where}", params).fetchone()[0]
+    
+    def top(self, map_size=None, limit=10, offset=0):
+        """
+        One page of the best scores.
+        
+        Args:
+            map_size: Key of MAP_SIZES, or None for every map size
+            limit: Entries per page
+            offset: Entries to skip (page * limit)
+        
+        Returns:
+            List of Score, best first (ties: earliest first)
+        """
+        where, params = self._where(map_size)
+        rows = self.connection.execute(
+            f"SELECT score, map_size, seed, duration, created FROM scores{where} "
+            "ORDER BY score DESC, id LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+        return [Score(*row) for row in rows]
+    
+    def rank(self, score, map_size=None):
+        """1-based position a score would take (ties share the better rank)."""
+        where, params = self._where(map_size, "score > ?")
+        return 1 + self.connection.execute(
+            f"SELECT COUNT(*) FROM scores{where}", [score] + params
+        ).fetchone()[0]
+    
+    def percentile(self, score, map_size=None):
+        """Percentage of recorded games that scored at most `score` (100 if there are none)."""
+        total = self.count(map_size)
+        if not total:
+            return 100.0
+        return 100.0 * (total - (self.rank(score, map_size) - 1)) / total
+    
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
@@ -0,0 +1,206 @@
+"""On-Disk Level Cache"""
+import mmap
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from .constants import LEVEL_CACHE_DIR, LEVEL_CACHE_BUDGET
+from .maze_generator import MazeGenerator
+from .world import Level
+
+MAGIC = b'DCLV'
+VERSION = 2
+
+# magic, version, maze algorithm index, map size name length, seed,
+# coin count, enemy count, maze width, maze height
+HEADER = struct.Struct('<4sBBBxQIIII')
+
+# Spawn tables start on this boundary so they can be viewed in place
+ALIGNMENT = 8
+
+SPAWN_DTYPE = np.dtype('<f8')
+
+
+def level_filename(map_size, seed, algorithm, coin_count, enemy_count):
+    """Cache file name of a level."""
+    return f"{map_size}-{algorithm}-{seed}-{coin_count}-{enemy_count}.lvl"
+
+
+def encode_level(level):
+    """
+    Serialize a Level.
+    
+    Layout: HEADER, map size name, padding to ALIGNMENT, coin and enemy
+    spawn tables (float64 x, y pairs), then the maze cells packed 8 per
+    byte.
+    
+    Returns:
+        bytes
+    """
+    name = level.map_size.encode('ascii')
+    header = HEADER.pack(
+        MAGIC, VERSION, MazeGenerator.ALGORITHMS.index(level.algorithm), len(name), level.seed,
+        len(level.coins), len(level.enemies), level.maze_width, level.maze_height
+    )
+    padding = -(len(header) + len(name)) % ALIGNMENT
+    cells = np.frombuffer(level.cells, dtype=np.uint8)
+    return b''.join((
+        header, name, bytes(padding),
+        np.ascontiguousarray(level.coins, dtype=SPAWN_DTYPE).tobytes(),
+        np.ascontiguousarray(level.enemies, dtype=SPAWN_DTYPE).tobytes(),
+        np.packbits(cells).tobytes(),
+    ))
+
+
+def decode_level(buffer):
+    """
+    Read a Level from encode_level() output without copying the spawn tables.
+    
+    The coin and enemy arrays are read-only views into `buffer` (e.g. an
+    mmap), so the buffer stays alive as long as they do.
+    
+    Returns:
+        Level
+    """
+    magic, version, algorithm, name_length, seed, coin_count, enemy_count, maze_width, maze_height = \
+        HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("not a cached level")
+    if version != VERSION:
+        raise ValueError(f"unsupported cached level version {version}")
+    
+    offset = HEADER.size
+    map_size = bytes(buffer[offset:offset + name_length]).decode('ascii')
+    offset += name_length
+    offset += -offset % ALIGNMENT
+    
+    coins = np.frombuffer(buffer, dtype=SPAWN_DTYPE, count=coin_count * 2, offset=offset).reshape(-1, 2)
+    offset += coins.nbytes
+    enemies = np.frombuffer(buffer, dtype=SPAWN_DTYPE, count=enemy_count * 2, offset=offset).reshape(-1, 2)
+    offset += enemies.nbytes
+    
+    cell_count = maze_width * maze_height
+    packed = np.frombuffer(buffer, dtype=np.uint8, count=(cell_count + 7) // 8, offset=offset)
+    cells = np.unpackbits(packed, count=cell_count).tobytes()
+    
+    return Level(
+        map_size, seed, MazeGenerator.ALGORITHMS[algorithm], coin_count, enemy_count,
+        maze_width, maze_height, cells, coins, enemies
+    )
+
+
+class LevelCache:
+    """
+    Directory of generated levels, evicted least recently used first.
+    
+    Levels are keyed by map size, maze algorithm, seed and entity counts
+    (everything that decides what generate_level() builds). Loading maps
+    the file and views the spawn tables in place; only the bit-packed maze
+    is expanded. When the files outgrow `budget` bytes the least recently
+    used ones are deleted.
+    """
+    
+    def __init__(self, directory=LEVEL_CACHE_DIR, budget=LEVEL_CACHE_BUDGET):
+        self.directory = directory
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        
+        # File name -> size in bytes, least recently used first
+        self.entries = OrderedDict()
+        if os.path.isdir(directory):
+            files = []
+            for entry in os.scandir(directory):
+                if entry.name.endswith('.lvl') and entry.is_file():
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+            for _, name, size in sorted(files):
+                self.entries[name] = size
+    
+    @property
+    def size(self):
+        """Total bytes of cached levels."""
+        return sum(self.entries.values())
+    
+    def load(self, map_size, seed, algorithm, coin_count, enemy_count):
+        """
+        A cached level, marked as most recently used.
+        
+        Returns:
+            Level, or None if it is not cached (or unreadable)
+        """
+        name = level_filename(map_size, seed, algorithm, coin_count, enemy_count)
+        if name not in self.entries:
+            return None
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            level = decode_level(buffer)
+            # Recency survives restarts through the modification time
+            os.utime(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Warning: Dropping cached level {name}: {e}")
+            self._remove(name)
+            return None
+        self.entries.move_to_end(name)
+        return level
+    
+    def store(self, level):
+        """Write a level to the cache, then evict down to the budget."""
+        name = level_filename(level.map_size, level.seed, level.algorithm,
+                              level.coin_count, level.enemy_count)
+        data = encode_level(level)
+        path = os.path.join(self.directory, name)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write aside and rename, so readers never map a half-written file
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, 'wb') as f:
+                f.write(data)
+            os.replace(temp, path)
+        except OSError as e:
+            print(f"Warning: Could not cache level: {e}")
+            return
+        self.entries[name] = len(data)
+        self.entries.move_to_end(name)
+        self.evict()
+    
+    def level_for(self, world):
+        """
+        The level `world` would generate, loaded from the cache if possible.
+        
+        Misses are generated and stored for next time.
+        
+        Returns:
+            Level
+        """
+        level = self.load(world.map_size, world.seed, world.algorithm,
+                          world.coin_count, world.enemy_count)
+        if level is not None:
+            self.hits += 1
+            return level
+        self.misses += 1
+        level = world.generate_level()
+        self.store(level)
+        return level
+    
+    def evict(self):
+        """Delete least recently used levels until the cache fits the budget."""
+        total = self.size
+        # The newest level always stays, even if it alone exceeds the budget
+        while total > self.budget and len(self.entries) > 1:
+            name = next(iter(self.entries))
+            total -= self.entries[name]
+            self._remove(name)
+    
+    def _remove(self, name):
+        """Forget a cache entry and delete its file."""
+        self.entries.pop(name, None)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            # Already gone, or still mapped on platforms that lock mapped files
+            pass
@@ -1,79 +1,271 @@
-"""Maze Generation using Recursive Backtracker Algorithm"""
+"""Maze Generation (Recursive Backtracker or Eller's Algorithm)"""
 import random
+from array import array
+import numpy as np
 from .constants import TILE_SIZE
 
 
+class Maze:
+    """
+    Compact maze grid: one byte per cell (1 = wall, 0 = passage).
+    
+    Cell (col, row) is centered at (offset_x + col * tile_size,
+    offset_y + row * tile_size) in pixels.
+    """
+    
+    def __init__(self, width, height, cells=None, offset_x=TILE_SIZE, offset_y=TILE_SIZE, tile_size=TILE_SIZE):
+        self.width = width
+        self.height = height
+        self.cells = cells if cells is not None else bytearray(b'\x01') * (width * height)
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.tile_size = tile_size
+    
+    @property
+    def grid(self):
+        """Zero-copy 2D view of the cells, indexed as grid[row, col]."""
+        return memoryview(self.cells).cast('B', (self.height, self.width))
+    
+    def is_wall(self, col, row):
+        """Check a cell. Cells outside the maze are open floor."""
+        return 0 <= col < self.width and 0 <= row < self.height and \
+            self.cells[row * self.width + col] == 1
+    
+    def cell_center(self, col, row):
+        """Pixel center of a cell."""
+        return (self.offset_x + col * self.tile_size,
+                self.offset_y + row * self.tile_size)
+    
+    def cell_at(self, x, y):
+        """(col, row) of the cell containing a pixel position."""
+        half = self.tile_size / 2
+        return (int((x - self.offset_x + half) // self.tile_size),
+                int((y - self.offset_y + half) // self.tile_size))
+    
+    def wall_indices(self):
+        """Flat indices (row * width + col) of all wall cells as a NumPy array."""
+        # Views the bytearray without copying; no per-cell Python work
+        return np.flatnonzero(np.frombuffer(self.cells, dtype=np.uint8))
+    
+    def wall_positions(self):
+        """Pixel centers of all wall cells as (xs, ys) NumPy arrays."""
+        rows, cols = np.divmod(self.wall_indices(), self.width)
+        return (self.offset_x + cols * self.tile_size,
+                self.offset_y + rows * self.tile_size)
+
+
 class MazeGenerator:
     """Generates maze obstacles for the game."""
     
+    # Selectable algorithms (see generate)
+    ALGORITHMS = ('backtracker', 'eller')
+    
     @staticmethod
-    def generate_maze(screen_width, screen_height, player_start_x, player_start_y):
+    def dimensions(screen_width, screen_height):
         """
-        Generate a maze using recursive backtracker algorithm.
+        Maze grid size for a play area.
         
-        Args:
-            screen_width: Width of the play area in pixels
-            screen_height: Height of the play area in pixels
-            player_start_x: Player starting X position
-            player_start_y: Player starting Y position
-            
         Returns:
-            List of (x, y) tuples representing wall positions
+            (maze_w, maze_h), both odd
         """
         # Calculate maze dimensions
         max_cells_x = (screen_width - 2 * TILE_SIZE) // TILE_SIZE
         max_cells_y = (screen_height - 2 * TILE_SIZE) // TILE_SIZE
-
+        
         # Maze cell dimensions (must be odd for proper maze generation)
         cols = max((max_cells_x - 1) // 2, 3)
         rows = max((max_cells_y - 1) // 2, 3)
-
-        maze_w = cols * 2 + 1
-        maze_h = rows * 2 + 1
-
-        # Initialize maze grid (False = wall, True = passage)
-        maze = [[False for _ in range(maze_w)] for _ in range(maze_h)]
-
-        # Recursive backtracker maze generation
-        start_x, start_y = 1, 1
-        maze[start_y][start_x] = True
-        stack = [(start_x, start_y)]
+        
+        return cols * 2 + 1, rows * 2 + 1
+    
+    @staticmethod
+    def floor_dimensions(screen_width, screen_height):
+        """
+        Grid size covering every whole tile of floor inside the border walls.
+        
+        The maze (see dimensions) leaves a strip of open floor of at least
+        one tile along the right and top border walls; generate() pads the
+        maze with it.
+        
+        Returns:
+            (floor_w, floor_h)
+        """
+        return screen_width // TILE_SIZE - 1, screen_height // TILE_SIZE - 1
+    
+    @staticmethod
+    def generate(screen_width, screen_height, player_start_x, player_start_y, rng=random,
+                 algorithm='backtracker'):
+        """
+        Generate a maze.
+        
+        Walls overlapping the player start position are already carved away.
+        The grid covers the whole floor (see floor_dimensions): the strip
+        between the maze and the border walls is open, with a door to it
+        in the maze's right and top walls.
+        
+        Args:
+            screen_width: Width of the play area in pixels
+            screen_height: Height of the play area in pixels
+            player_start_x: Player starting X position
+            player_start_y: Player starting Y position
+            rng: random.Random to draw from (default: the global generator)
+            algorithm: 'backtracker' (recursive backtracker, whole grid in
+                memory) or 'eller' (Eller's algorithm, built row by row)
+        
+        Returns:
+            Maze grid
+        """
+        maze_w, maze_h = MazeGenerator.dimensions(screen_width, screen_height)
+        if algorithm == 'backtracker':
+            maze = MazeGenerator._backtracker(maze_w, maze_h, rng)
+        elif algorithm == 'eller':
+            cells = bytearray().join(MazeGenerator.eller_rows(screen_width, screen_height, rng))
+            maze = Maze(maze_w, maze_h, cells)
+        else:
+            raise ValueError(f"Unknown maze algorithm {algorithm!r}, choose from {MazeGenerator.ALGORITHMS}")
+        cells = maze.cells
+        
+        # Clear walls that would overlap player start position
+        start_col, start_row = maze.cell_at(player_start_x, player_start_y)
+        for row in range(max(start_row - 1, 0), min(start_row + 2, maze_h)):
+            for col in range(max(start_col - 1, 0), min(start_col + 2, maze_w)):
+                cx, cy = maze.cell_center(col, row)
+                if abs(cx - player_start_x) < TILE_SIZE and \
+                   abs(cy - player_start_y) < TILE_SIZE:
+                    cells[row * maze_w + col] = 0
+        
+        # Open a door in the middle of the right and top outer walls, so
+        # the floor strip between the maze and the border walls can be
+        # reached, then pad the grid with that strip
+        cells[(maze_h // 2 | 1) * maze_w + maze_w - 1] = 0
+        cells[(maze_h - 1) * maze_w + (maze_w // 2 | 1)] = 0
+        floor_w, floor_h = MazeGenerator.floor_dimensions(screen_width, screen_height)
+        floor = bytearray(floor_w * floor_h)
+        for row in range(maze_h):
+            floor[row * floor_w:row * floor_w + maze_w] = cells[row * maze_w:(row + 1) * maze_w]
+        return Maze(floor_w, floor_h, floor)
+    
+    @staticmethod
+    def _backtracker(maze_w, maze_h, rng):
+        """Recursive backtracker over the whole grid."""
+        # Initialize maze grid (all walls)
+        maze = Maze(maze_w, maze_h)
+        cells = maze.cells
+        
+        # Recursive backtracker maze generation. The stack holds flat cell
+        # indices in a typed array (4 bytes each) so huge mazes stay small.
+        start = 1 * maze_w + 1
+        cells[start] = 0
+        stack = array('I', [start])
         
         while stack:
-            x, y = stack[-1]
+            index = stack[-1]
+            y, x = divmod(index, maze_w)
             neighbors = []
             
             # Check all 4 directions (2 cells away for proper maze structure)
             for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2)):
                 nx, ny = x + dx, y + dy
-                if 1 <= nx < maze_w - 1 and 1 <= ny < maze_h - 1 and not maze[ny][nx]:
-                    neighbors.append((nx, ny))
+                if 1 <= nx < maze_w - 1 and 1 <= ny < maze_h - 1 and cells[ny * maze_w + nx]:
+                    neighbors.append(ny * maze_w + nx)
             
             if neighbors:
-                nx, ny = random.choice(neighbors)
+                neighbor = rng.choice(neighbors)
                 # Carve passage between current cell and chosen neighbor
-                maze[ny][nx] = True
-                maze[y + (ny - y) // 2][x + (nx - x) // 2] = True
-                stack.append((nx, ny))
+                cells[neighbor] = 0
+                cells[(index + neighbor) // 2] = 0
+                stack.append(neighbor)
             else:
                 stack.pop()
-
-        # Convert maze grid to wall positions
-        wall_positions = []
-        offset_x = TILE_SIZE
-        offset_y = TILE_SIZE
         
-        for row in range(maze_h):
-            for col in range(maze_w):
-                if not maze[row][col]:
-                    cx = offset_x + col * TILE_SIZE
-                    cy = offset_y + row * TILE_SIZE
-                    
-                    # Skip if wall would overlap player start position
-                    if abs(cx - player_start_x) < TILE_SIZE and \
-                       abs(cy - player_start_y) < TILE_SIZE:
-                        continue
-                    
-                    wall_positions.append((cx, cy))
-        
-        return wall_positions
+        return maze
+    
+    @staticmethod
+    def eller_rows(screen_width, screen_height, rng=random):
+        """
+        Eller's algorithm: yield the maze grid one row at a time, bottom up.
+        
+        Only the set labels of the current row are kept, so working memory
+        is O(width) however tall the maze is. Each yielded row is a
+        bytearray of maze_w cells (1 = wall, 0 = passage); the player start
+        is not carved (generate() does that).
+        
+        Args:
+            screen_width: Width of the play area in pixels
+            screen_height: Height of the play area in pixels
+            rng: random.Random to draw from (default: the global generator)
+        """
+        maze_w, maze_h = MazeGenerator.dimensions(screen_width, screen_height)
+        cols, rows = maze_w // 2, maze_h // 2
+        wall_row = bytes(b'\x01') * maze_w
+        
+        # Set label of every cell in the current row
+        sets = list(range(cols))
+        next_label = cols
+        
+        yield bytearray(wall_row)
+        for row in range(rows):
+            last = row == rows - 1
+            
+            # Open the cells, then join neighbours from different sets at
+            # random (the last row joins all of them)
+            line = bytearray(wall_row)
+            line[1:maze_w - 1:2] = bytes(cols)
+            # Columns of every set; a join relabels only the smaller set,
+            # so a row costs O(width log width)
+            columns = {}
+            for col, label in enumerate(sets):
+                columns.setdefault(label, []).append(col)
+            for col in range(cols - 1):
+                if sets[col] != sets[col + 1] and (last or rng.random() < 0.5):
+                    line[2 * col + 2] = 0
+                    kept, merged = sets[col], sets[col + 1]
+                    if len(columns[kept]) < len(columns[merged]):
+                        kept, merged = merged, kept
+                    for other in columns[merged]:
+                        sets[other] = kept
+                    columns[kept].extend(columns.pop(merged))
+            yield line
+            if last:
+                break
+            
+            # Every set carries down at least once; cells not carried down
+            # start new sets in the next row
+            members = {}
+            for col, label in enumerate(sets):
+                members.setdefault(label, []).append(col)
+            below = bytearray(wall_row)
+            next_sets = [0] * cols
+            for col, label in enumerate(sets):
+                next_sets[col] = next_label
+                next_label += 1
+            for label, group in members.items():
+                down = [col for col in group if rng.random() < 0.5] or [rng.choice(group)]
+                for col in down:
+                    below[2 * col + 1] = 0
+                    next_sets[col] = label
+            sets = next_sets
+            yield below
+        yield bytearray(wall_row)
+    
+    @staticmethod
+    def generate_maze(screen_width, screen_height, player_start_x, player_start_y, rng=random,
+                      algorithm='backtracker'):
+        """
+        Generate a maze.
+        
+        Args:
+            screen_width: Width of the play area in pixels
+            screen_height: Height of the play area in pixels
+            player_start_x: Player starting X position
+            player_start_y: Player starting Y position
+            rng: random.Random to draw from (default: the global generator)
+            algorithm: 'backtracker' or 'eller' (see generate)
+        
+        Returns:
+            List of (x, y) tuples representing wall positions
+        """
+        xs, ys = MazeGenerator.generate(
+            screen_width, screen_height, player_start_x, player_start_y, rng, algorithm
+        ).wall_positions()
+        return list(zip(xs.tolist(), ys.tolist()))
@@ -2,17 +2,64 @@
 import arcade
 from .constants import (
     STATE_MENU, STATE_SETTINGS, STATE_HIGHSCORE, STATE_PAUSED, STATE_GAME_OVER, STATE_MAP_SIZE,
-    SCREEN_WIDTH, SCREEN_HEIGHT, MAP_SIZES
+    STATE_LOADING, SCREEN_WIDTH, SCREEN_HEIGHT, MAP_SIZES, MAX_SCORES
 )
+from .text_cache import TextCache
 
 
 class MenuRenderer:
     """Handles all menu rendering."""
     
-    @staticmethod
-    def draw_main_menu():
+    def __init__(self):
+        # One set of persistent labels per screen
+        self.screens = {}
+    
+    def _texts(self, screen):
+        """Text cache for one screen."""
+        texts = self.screens.get(screen)
+        if texts is None:
+            texts = self.screens[screen] = TextCache()
+        return texts
+    
+    def draw_loading(self, progress, label):
+        """
+        Draw the loading screen.
+        
+        Args:
+            progress: Fraction done (0-1)
+            label: What is being loaded
+        """
+        left, right = SCREEN_WIDTH / 2 - 200, SCREEN_WIDTH / 2 + 200
+        bottom, top = SCREEN_HEIGHT / 2 - 12, SCREEN_HEIGHT / 2 + 12
+        arcade.draw_lrbt_rectangle_filled(left, left + (right - left) * progress, bottom, top, arcade.color.GOLD)
+        arcade.draw_lrbt_rectangle_outline(left, right, bottom, top, arcade.color.WHITE, 2)
+        
+        texts = self._texts(STATE_LOADING)
+        texts.text(
+            "title",
+            "DUNGEON CRAWLER",
+            SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 150,
+            arcade.color.WHITE,
+            54,
+            anchor_x="center",
+            bold=True
+        )
+        
+        texts.text(
+            "label",
+            f"{label}... {progress * 100:.0f}%",
+            SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 50,
+            arcade.color.LIGHT_GRAY,
+            18,
+            anchor_x="center"
+        )
+        texts.draw()
+    
+    def draw_main_menu(self):
         """Draw the main menu."""
-        arcade.draw_text(
+        texts = self._texts(STATE_MENU)
+        texts.text(
+            "title",
             "DUNGEON CRAWLER",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 150,
             arcade.color.WHITE,
@@ -21,7 +68,8 @@ class MenuRenderer:
             bold=True
         )
         
-        arcade.draw_text(
+        texts.text(
+            "start",
             "Press ENTER to Start",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50,
             arcade.color.WHITE,
@@ -29,7 +77,8 @@ class MenuRenderer:
             anchor_x="center"
         )
         
-        arcade.draw_text(
+        texts.text(
+            "map_size",
             "Press M for Map Size",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2,
             arcade.color.WHITE,
@@ -37,7 +86,8 @@ class MenuRenderer:
             anchor_x="center"
         )
         
-        arcade.draw_text(
+        texts.text(
+            "settings",
             "Press S for Settings",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 40,
             arcade.color.WHITE,
@@ -45,7 +95,8 @@ class MenuRenderer:
             anchor_x="center"
         )
         
-        arcade.draw_text(
+        texts.text(
+            "highscores",
             "Press H for Highscores",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 80,
             arcade.color.WHITE,
@@ -53,18 +104,21 @@ class MenuRenderer:
             anchor_x="center"
         )
         
-        arcade.draw_text(
+        texts.text(
+            "quit",
             "Press ESC to Quit",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 120,
             arcade.color.WHITE,
             24,
             anchor_x="center"
         )
+        texts.draw()
     
-    @staticmethod
-    def draw_map_size_menu(current_size):
+    def draw_map_size_menu(self, current_size):
         """Draw the map size selection menu."""
-        arcade.draw_text(
+        texts = self._texts(STATE_MAP_SIZE)
+        texts.text(
+            "title",
             "SELECT MAP SIZE",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 180,
             arcade.color.WHITE,
@@ -77,16 +131,18 @@ class MenuRenderer:
         for i, (name, (width, height)) in enumerate(MAP_SIZES.items()):
             color = arcade.color.GOLD if name == current_size else arcade.color.WHITE
             key_num = i + 1
-            arcade.draw_text(
+            texts.text(
+                ("size", name),
                 f"{key_num}. {name.upper()}: {width}x{height}px",
-                SCREEN_WIDTH / 2, y_start - i * 50,
+                SCREEN_WIDTH / 2, y_start - i * 40,
                 color,
                 28 if name == current_size else 24,
                 anchor_x="center",
                 bold=name == current_size
             )
         
-        arcade.draw_text(
+        texts.text(
+            "current",
             f"Current: {current_size.upper()}",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 120,
             arcade.color.LIGHT_GRAY,
@@ -94,18 +150,21 @@ class MenuRenderer:
             anchor_x="center"
         )
         
-        arcade.draw_text(
-            "Press 1-4 to select, ESC to return",
+        texts.text(
+            "hint",
+            f"Press 1-{len(MAP_SIZES)} to select, ESC to return",
             SCREEN_WIDTH / 2, 50,
             arcade.color.LIGHT_GRAY,
             18,
             anchor_x="center"
         )
+        texts.draw()
     
-    @staticmethod
-    def draw_settings():
+    def draw_settings(self):
         """Draw the settings screen."""
-        arcade.draw_text(
+        texts = self._texts(STATE_SETTINGS)
+        texts.text(
+            "title",
             "CONTROLS",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 180,
             arcade.color.WHITE,
@@ -126,7 +185,8 @@ class MenuRenderer:
         
         y_start = SCREEN_HEIGHT / 2 + 100
         for i, text in enumerate(controls):
-            arcade.draw_text(
+            texts.text(
+                ("control", i),
                 text,
                 SCREEN_WIDTH / 2, y_start - i * 40,
                 arcade.color.WHITE if text else arcade.color.DARK_GRAY,
@@ -135,47 +195,89 @@ class MenuRenderer:
                 bold=text.endswith(":")
             )
         
-        arcade.draw_text(
+        texts.text(
+            "hint",
             "Press ESC to return to menu",
             SCREEN_WIDTH / 2, 50,
             arcade.color.LIGHT_GRAY,
             18,
             anchor_x="center"
         )
+        texts.draw()
     
-    @staticmethod
-    def draw_highscores(highscores):
-        """Draw the highscore screen."""
-        arcade.draw_text(
+    def draw_highscores(self, entries, map_size, page, pages, per_page):
+        """
+        Draw one page of the highscore screen.
+        
+        Args:
+            entries: Score entries of this page, best first
+            map_size: Map size shown (None = all sizes)
+            page: 0-based page number
+            pages: Number of pages
+            per_page: Entries per full page
+        """
+        texts = self._texts(STATE_HIGHSCORE)
+        texts.text(
+            "title",
             "HIGH SCORES",
-            SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 180,
+            SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 200,
             arcade.color.WHITE,
             44,
             anchor_x="center",
             bold=True
         )
         
+        texts.text(
+            "map_size",
+            f"{map_size.upper() if map_size else 'ALL SIZES'} - page {page + 1}/{pages}",
+            SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 150,
+            arcade.color.LIGHT_GRAY,
+            20,
+            anchor_x="center"
+        )
+        
+        if not entries:
+            texts.text(
+                "empty",
+                "No scores yet",
+                SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2,
+                arcade.color.WHITE,
+                24,
+                anchor_x="center"
+            )
+        
         y_start = SCREEN_HEIGHT / 2 + 100
-        for i, score in enumerate(highscores[:10]):
-            arcade.draw_text(
-                f"{i + 1}. {score}",
-                SCREEN_WIDTH / 2, y_start - i * 40,
-                arcade.color.GOLD if i == 0 else arcade.color.WHITE,
-                28 if i == 0 else 24,
+        for i, entry in enumerate(entries):
+            rank = page * per_page + i + 1
+            details = []
+            if map_size is None and entry.map_size:
+                details.append(entry.map_size)
+            if entry.duration is not None:
+                minutes, seconds = divmod(int(entry.duration), 60)
+                details.append(f"{minutes}:{seconds:02d}")
+            if entry.seed is not None:
+                details.append(f"seed {entry.seed}")
+            texts.text(
+                ("score", i),
+                f"{rank}. {entry.score}" + (f"  ({', '.join(details)})" if details else ""),
+                SCREEN_WIDTH / 2, y_start - i * 36,
+                arcade.color.GOLD if rank == 1 else arcade.color.WHITE,
+                24 if rank == 1 else 20,
                 anchor_x="center",
-                bold=i < 3
+                bold=rank <= 3
             )
         
-        arcade.draw_text(
-            "Press ESC to return to menu",
+        texts.text(
+            "hint",
+            f"1-{len(MAP_SIZES)}: map size, 0: all sizes, LEFT/RIGHT: page, ESC: menu",
             SCREEN_WIDTH / 2, 50,
             arcade.color.LIGHT_GRAY,
             18,
             anchor_x="center"
         )
+        texts.draw()
     
-    @staticmethod
-    def draw_pause_overlay():
+    def draw_pause_overlay(self):
         """Draw pause menu overlay."""
         # Semi-transparent overlay
         arcade.draw_lrbt_rectangle_filled(
@@ -183,7 +285,9 @@ class MenuRenderer:
             (0, 0, 0, 180)
         )
         
-        arcade.draw_text(
+        texts = self._texts(STATE_PAUSED)
+        texts.text(
+            "title",
             "PAUSED",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 80,
             arcade.color.WHITE,
@@ -192,7 +296,8 @@ class MenuRenderer:
             bold=True
         )
         
-        arcade.draw_text(
+        texts.text(
+            "resume",
             "Press P or ESC to Resume",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2,
             arcade.color.WHITE,
@@ -200,17 +305,27 @@ class MenuRenderer:
             anchor_x="center"
         )
         
-        arcade.draw_text(
+        texts.text(
+            "quit",
             "Press Q to Quit to Menu",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 40,
             arcade.color.WHITE,
             24,
             anchor_x="center"
         )
+        texts.draw()
     
-    @staticmethod
-    def draw_game_over(player_health, score, is_high_score):
-        """Draw game over screen."""
+    def draw_game_over(self, player_health, score, rank, percentile, map_size):
+        """
+        Draw game over screen.
+        
+        Args:
+            player_health: Health left (0 = died)
+            score: Final score
+            rank: Leaderboard rank of the score on this map size
+            percentile: Percentage of games on this map size scoring at most as much
+            map_size: Map size played
+        """
         # Semi-transparent overlay
         arcade.draw_lrbt_rectangle_filled(
             0, SCREEN_WIDTH, 0, SCREEN_HEIGHT,
@@ -220,7 +335,9 @@ class MenuRenderer:
         game_over_text = "YOU DIED!" if player_health <= 0 else "YOU WIN!"
         text_color = arcade.color.RED if player_health <= 0 else arcade.color.GOLD
         
-        arcade.draw_text(
+        texts = self._texts(STATE_GAME_OVER)
+        texts.text(
+            "title",
             game_over_text,
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 100,
             text_color,
@@ -229,7 +346,8 @@ class MenuRenderer:
             bold=True
         )
         
-        arcade.draw_text(
+        texts.text(
+            "score",
             f"Final Score: {score}",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 30,
             arcade.color.WHITE,
@@ -238,17 +356,28 @@ class MenuRenderer:
         )
         
         # Check if it's a new highscore
-        if is_high_score:
-            arcade.draw_text(
-                "NEW HIGH SCORE!",
+        if score > 0 and rank is not None and rank <= MAX_SCORES:
+            texts.text(
+                "high_score",
+                f"NEW HIGH SCORE! #{rank} on {map_size.upper()}",
                 SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 20,
                 arcade.color.GOLD,
                 28,
                 anchor_x="center",
                 bold=True
             )
+        elif rank is not None:
+            texts.text(
+                "rank",
+                f"Rank {rank} on {map_size.upper()} (better than or equal to {percentile:.0f}% of games)",
+                SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 20,
+                arcade.color.LIGHT_GRAY,
+                18,
+                anchor_x="center"
+            )
         
-        arcade.draw_text(
+        texts.text(
+            "play_again",
             "Press ENTER to Play Again",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 80,
             arcade.color.WHITE,
@@ -256,10 +385,12 @@ class MenuRenderer:
             anchor_x="center"
         )
         
-        arcade.draw_text(
+        texts.text(
+            "menu",
             "Press ESC to Return to Menu",
             SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 120,
             arcade.color.WHITE,
             24,
             anchor_x="center"
         )
+        texts.draw()
@@ -0,0 +1,107 @@
+"""Maze-Aware Enemy Pathfinding"""
+from array import array
+from collections import deque
+
+import numpy as np
+
+
+class FlowField:
+    """
+    BFS distance field over the maze, pointing every open cell toward a target.
+    
+    The field is rebuilt only when the target (the player's cell) changes.
+    Enemies then look up their next cell in O(1) instead of each one
+    searching a path. On large maps the search can be limited to a
+    rectangle of cells around the target.
+    """
+    
+    def __init__(self, maze):
+        self.maze = maze
+        self.target = None
+        self.bounds = None
+        self.rebuilds = 0
+        
+        count = maze.width * maze.height
+        # Steps to the target, -1 = unreachable
+        self.distances = array('i', [-1]) * count
+        # Neighbouring cell one step closer to the target, -1 = none
+        self.next_cells = array('i', [-1]) * count
+    
+    def update(self, col, row, bounds=None):
+        """
+        Point the field at a target cell.
+        
+        Args:
+            col, row: Target cell
+            bounds: (min_col, min_row, max_col, max_row) cells the search may
+                visit, inclusive (default: the whole maze). Cells outside
+                stay unreachable.
+        
+        Returns:
+            True if the field was rebuilt, False if nothing changed
+        """
+        if (col, row) == self.target and bounds == self.bounds:
+            return False
+        self.target = (col, row)
+        self.bounds = bounds
+        self.rebuilds += 1
+        
+        maze = self.maze
+        width, height = maze.width, maze.height
+        if bounds is None:
+            min_col, min_row, max_col, max_row = 0, 0, width - 1, height - 1
+        else:
+            min_col, min_row = max(bounds[0], 0), max(bounds[1], 0)
+            max_col, max_row = min(bounds[2], width - 1), min(bounds[3], height - 1)
+        cells = maze.cells
+        distances = self.distances
+        next_cells = self.next_cells
+        count = width * height
+        distances[:] = array('i', [-1]) * count
+        next_cells[:] = array('i', [-1]) * count
+        
+        if not (min_col <= col <= max_col and min_row <= row <= max_row) or cells[row * width + col]:
+            return True
+        
+        start = row * width + col
+        distances[start] = 0
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            distance = distances[index] + 1
+            y, x = divmod(index, width)
+            
+            for neighbor, valid in ((index + 1, x < max_col), (index - 1, x > min_col),
+                                    (index + width, y < max_row), (index - width, y > min_row)):
+                if valid and not cells[neighbor] and distances[neighbor] < 0:
+                    distances[neighbor] = distance
+                    next_cells[neighbor] = index
+                    queue.append(neighbor)
+        return True
+    
+    def next_steps(self, xs, ys, default_x, default_y):
+        """
+        Pixel centers of the next cells on the way to the target, for
+        arrays of pixel positions.
+        
+        Positions whose cell is the target or cannot reach it get
+        (default_x, default_y) instead.
+        
+        Returns:
+            (target_xs, target_ys) arrays
+        """
+        maze = self.maze
+        size = maze.tile_size
+        half = size / 2
+        next_cells = np.frombuffer(self.next_cells, dtype=np.intc)
+        
+        cols = np.floor((xs - maze.offset_x + half) / size).astype(np.intp)
+        rows = np.floor((ys - maze.offset_y + half) / size).astype(np.intp)
+        inside = (cols >= 0) & (cols < maze.width) & (rows >= 0) & (rows < maze.height)
+        nxt = np.where(inside, next_cells[np.where(inside, rows * maze.width + cols, 0)], -1)
+        found = nxt >= 0
+        next_rows, next_cols = np.divmod(nxt, maze.width)
+        
+        target_xs = np.where(found, maze.offset_x + next_cols * size, default_x)
+        target_ys = np.where(found, maze.offset_y + next_rows * size, default_y)
+        return target_xs, target_ys
@@ -0,0 +1,80 @@
+"""Background Level Pregeneration"""
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .constants import PREGENERATE_LEVELS
+from .world import World
+
+
+def build_level(map_size, seed, options):
+    """Generate one Level (runs in a worker process)."""
+    return World(map_size, seed=seed, **options).generate_level()
+
+
+class LevelPregenerator:
+    """
+    Generates upcoming levels in a pool of worker processes.
+    
+    A bounded queue holds the next `ahead` levels for the selected map size
+    and World options (entity counts, maze algorithm). take() hands out a
+    finished level and queues a replacement, so restarting never waits for
+    maze generation; when no level is ready yet it returns None and the
+    caller generates one itself.
+    """
+    
+    def __init__(self, ahead=PREGENERATE_LEVELS, workers=None):
+        self.ahead = ahead
+        self.workers = workers or max(1, min(ahead, (os.cpu_count() or 2) - 1))
+        self.executor = None
+        self.pending = deque()
+        self.settings = None
+        self.hits = 0
+        self.misses = 0
+    
+    def prefetch(self, map_size, **options):
+        """Fill the queue with levels for these settings, dropping levels for others."""
+        if self.ahead <= 0:
+            return
+        settings = (map_size, sorted(options.items()))
+        if settings != self.settings:
+            self._cancel()
+            self.settings = settings
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+        while len(self.pending) < self.ahead:
+            seed = random.randrange(2 ** 32)
+            self.pending.append(self.executor.submit(build_level, map_size, seed, options))
+    
+    def take(self, map_size, **options):
+        """
+        A ready level for these settings, queueing a new one in its place.
+        
+        Returns:
+            Level, or None if none has finished yet
+        """
+        level = None
+        if (map_size, sorted(options.items())) == self.settings and self.pending and self.pending[0].done():
+            future = self.pending.popleft()
+            if not future.cancelled() and future.exception() is None:
+                level = future.result()
+        if level is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self.prefetch(map_size, **options)
+        return level
+    
+    def _cancel(self):
+        """Drop queued levels."""
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+    
+    def shutdown(self):
+        """Stop the workers without waiting for queued levels."""
+        self._cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,113 @@
+"""Per-Stage Frame Timing"""
+import csv
+import json
+import time
+
+import numpy as np
+
+
+class _Timer:
+    """Context manager recording one sample for a stage."""
+    
+    __slots__ = ('profiler', 'name', 'start')
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """
+    Times named stages of a frame into fixed-size ring buffers.
+    
+    Each stage keeps its last `history` samples, so memory stays constant
+    however long the game runs. Wrap a stage in `with profiler.stage(name):`
+    and read p50/p95/p99 from summary().
+    """
+    
+    PERCENTILES = (50, 95, 99)
+    
+    def __init__(self, history=600):
+        self.history = history
+        self.enabled = True
+        # Stage name -> [samples in seconds, next write position, samples written]
+        self.stages = {}
+    
+    def stage(self, name):
+        """Context manager timing one run of a stage."""
+        return _Timer(self, name)
+    
+    def record(self, name, seconds):
+        """Add a sample (in seconds) to a stage's ring buffer."""
+        if not self.enabled:
+            return
+        buffer = self.stages.get(name)
+        if buffer is None:
+            buffer = self.stages[name] = [np.zeros(self.history), 0, 0]
+        samples, cursor, written = buffer
+        samples[cursor] = seconds
+        buffer[1] = (cursor + 1) % self.history
+        buffer[2] = written + 1
+    
+    def reset(self):
+        """Forget all samples."""
+        self.stages = {}
+    
+    def samples(self, name):
+        """Samples of a stage in seconds, oldest first."""
+        samples, cursor, written = self.stages[name]
+        if written < self.history:
+            return samples[:written].copy()
+        return np.concatenate((samples[cursor:], samples[:cursor]))
+    
+    def summary(self):
+        """
+        Timing statistics per stage, in milliseconds.
+        
+        Returns:
+            {stage: {'count', 'mean', 'max', 'p50', 'p95', 'p99'}} in the
+            order the stages were first recorded
+        """
+        result = {}
+        for name in self.stages:
+            samples = self.samples(name) * 1000
+            stats = {
+                'count': len(samples),
+                'mean': float(samples.mean()),
+                'max': float(samples.max()),
+            }
+            for p, value in zip(self.PERCENTILES, np.percentile(samples, self.PERCENTILES)):
+                stats[f'p{p}'] = float(value)
+            result[name] = stats
+        return result
+    
+    def dump(self, filename):
+        """
+        Write the timings to a file.
+        
+        A .json file gets the summary and the raw samples (ms, oldest
+        first); any other extension gets one CSV row of summary per stage.
+        """
+        summary = self.summary()
+        if filename.endswith('.json'):
+            data = {
+                'summary': summary,
+                'samples': {name: (self.samples(name) * 1000).tolist() for name in self.stages},
+            }
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=2)
+        else:
+            fields = ['count', 'mean', 'max'] + [f'p{p}' for p in self.PERCENTILES]
+            with open(filename, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['stage'] + [field if field == 'count' else f'{field}_ms' for field in fields])
+                for name, stats in summary.items():
+                    writer.writerow([name] + [stats[field] for field in fields])
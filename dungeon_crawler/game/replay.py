@@ -0,0 +1,134 @@
+"""Input Recording and Replay"""
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from .maze_generator import MazeGenerator
+from .world import World
+
+MAGIC = b'DCRP'
+VERSION = 3
+
+# A game starts with this byte followed by GAME_HEADER and the map size name
+GAME_MARKER = 0xFF
+# seed, coin count, enemy count, maze algorithm index, name length
+GAME_HEADER = struct.Struct('<QIIBB')
+
+# One tick: packed input byte + delta time. Input bits: 0-1 dx + 1,
+# 2-3 dy + 1, 4 attack. A packed input never equals GAME_MARKER.
+TICK_DTYPE = np.dtype([('input', 'u1'), ('delta_time', '<f8')])
+
+Recording = namedtuple('Recording', 'map_size seed algorithm coin_count enemy_count ticks')
+
+
+def pack_input(dx, dy, attack):
+    """Pack one tick's input into a byte."""
+    return (dx + 1) | (dy + 1) << 2 | bool(attack) << 4
+
+
+def unpack_input(packed):
+    """
+    Unpack an input byte.
+    
+    Returns:
+        (dx, dy, attack)
+    """
+    return (packed & 3) - 1, (packed >> 2 & 3) - 1, bool(packed & 16)
+
+
+class InputRecorder:
+    """
+    Writes the input of every simulation tick to a compact binary file.
+    
+    Each tick costs 9 bytes (packed input and the exact delta time), so
+    replaying it with the same seed reproduces the game frame for frame.
+    One file holds every game played while it is open.
+    """
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open(filename, 'wb')
+        self.file.write(MAGIC + bytes([VERSION]))
+        self.ticks = 0
+    
+    def start(self, world):
+        """Begin recording a freshly set up World."""
+        name = world.map_size.encode('ascii')
+        self.file.write(bytes([GAME_MARKER]))
+        self.file.write(GAME_HEADER.pack(
+            world.seed, world.coin_count, world.enemy_count,
+            MazeGenerator.ALGORITHMS.index(world.algorithm), len(name)
+        ))
+        self.file.write(name)
+        world.recorder = self
+    
+    def record(self, delta_time, dx, dy, attack):
+        """Append one tick (called by World.step)."""
+        self.file.write(struct.pack('<Bd', pack_input(dx, dy, attack), delta_time))
+        self.ticks += 1
+    
+    def close(self):
+        """Flush and close the file."""
+        if not self.file.closed:
+            self.file.close()
+
+
+def load_recordings(filename):
+    """
+    Read every game from a recording file.
+    
+    Returns:
+        List of Recording; `ticks` is a TICK_DTYPE array
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{filename} is not an input recording")
+    if data[len(MAGIC)] != VERSION:
+        raise ValueError(f"{filename} has unsupported version {data[len(MAGIC)]}")
+    
+    recordings = []
+    offset = len(MAGIC) + 1
+    while offset < len(data):
+        if data[offset] != GAME_MARKER:
+            raise ValueError(f"{filename} is corrupt at byte {offset}")
+        seed, coin_count, enemy_count, algorithm, name_length = GAME_HEADER.unpack_from(data, offset + 1)
+        offset += 1 + GAME_HEADER.size
+        map_size = data[offset:offset + name_length].decode('ascii')
+        offset += name_length
+        
+        # Ticks run until the next game marker (or a truncated last tick)
+        count = (len(data) - offset) // TICK_DTYPE.itemsize
+        ticks = np.frombuffer(data, dtype=TICK_DTYPE, count=count, offset=offset)
+        markers = np.flatnonzero(ticks['input'] == GAME_MARKER)
+        if len(markers):
+            ticks = ticks[:markers[0]]
+        offset += len(ticks) * TICK_DTYPE.itemsize
+        if not len(markers):
+            offset = len(data)
+        recordings.append(Recording(
+            map_size, seed, MazeGenerator.ALGORITHMS[algorithm], coin_count, enemy_count, ticks
+        ))
+    return recordings
+
+
+def replay(recording, profiler=None):
+    """
+    Play a recording back as fast as possible, without a window.
+    
+    Returns:
+        The World after the last tick
+    """
+    world = World(
+        recording.map_size, profiler=profiler, seed=recording.seed, algorithm=recording.algorithm,
+        coin_count=recording.coin_count, enemy_count=recording.enemy_count
+    )
+    world.setup()
+    for packed, delta_time in recording.ticks.tolist():
+        dx, dy, attack = unpack_input(packed)
+        world.set_movement(dx, dy)
+        if attack:
+            world.attack()
+        world.step(delta_time)
+    return world
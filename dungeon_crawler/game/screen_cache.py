@@ -0,0 +1,51 @@
+"""Cached Static Screens"""
+from arcade.gl import geometry
+
+
+class ScreenCache:
+    """
+    The last frame of a static screen, kept in an offscreen framebuffer.
+    
+    Menus, the pause screen and the game over screen only change on input.
+    capture() draws such a screen into the framebuffer once; until
+    invalidate() is called, every frame just copies it to the window with
+    one full-screen quad instead of redrawing the menu texts, or the whole
+    game scene under the pause overlay.
+    """
+    
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.framebuffer = None
+        self.quad = geometry.quad_2d_fs()
+        self.valid = False
+        self.captures = 0  # Screens drawn into the cache, for profiling
+    
+    def invalidate(self):
+        """Redraw the screen on the next frame."""
+        self.valid = False
+    
+    def capture(self, draw, size, background_color):
+        """
+        Draw a screen into the cache.
+        
+        Args:
+            draw: Function drawing the screen
+            size: Framebuffer size of the window in pixels
+            background_color: Color to clear the cache with first
+        """
+        if self.framebuffer is None or self.framebuffer.size != size:
+            self.framebuffer = self.ctx.framebuffer(
+                color_attachments=[self.ctx.texture(size, components=4)]
+            )
+        with self.framebuffer.activate():
+            self.framebuffer.clear(color=background_color)
+            draw()
+        self.valid = True
+        self.captures += 1
+    
+    def draw(self):
+        """Copy the cached screen to the window."""
+        self.framebuffer.color_attachments[0].use(0)
+        # Translucent overlays left alpha below 1 in the cache; copy as is
+        with self.ctx.enabled_only():
+            self.quad.render(self.ctx.utility_textured_quad_program)
@@ -0,0 +1,64 @@
+"""Uniform-Grid Spatial Index"""
+import math
+
+from .constants import TILE_SIZE
+
+
+class SpatialGrid:
+    """
+    Buckets items by the grid cell their center is in.
+    
+    Radius queries only look at the cells the query circle touches, and an
+    item that moves within its cell costs nothing to keep indexed.
+    """
+    
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.buckets = {}
+        self.cells = {}
+    
+    def __len__(self):
+        return len(self.cells)
+    
+    def cell_of(self, x, y):
+        """(col, row) of the bucket holding a pixel position."""
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+    
+    def insert(self, item, x, y):
+        """Add an item at a position."""
+        cell = self.cell_of(x, y)
+        self.cells[item] = cell
+        self.buckets.setdefault(cell, set()).add(item)
+    
+    def remove(self, item):
+        """Forget an item."""
+        cell = self.cells.pop(item)
+        bucket = self.buckets[cell]
+        bucket.discard(item)
+        if not bucket:
+            del self.buckets[cell]
+    
+    def move(self, item, x, y):
+        """Update an item's position; only rebuckets when it changed cells."""
+        cell = self.cell_of(x, y)
+        if self.cells[item] != cell:
+            self.remove(item)
+            self.cells[item] = cell
+            self.buckets.setdefault(cell, set()).add(item)
+    
+    def query(self, x, y, radius):
+        """
+        Candidate items near a point.
+        
+        Returns every item in a cell overlapping the circle's bounding box;
+        callers do the exact distance test.
+        """
+        min_col, min_row = self.cell_of(x - radius, y - radius)
+        max_col, max_row = self.cell_of(x + radius, y + radius)
+        found = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                bucket = self.buckets.get((col, row))
+                if bucket:
+                    found.extend(bucket)
+        return found
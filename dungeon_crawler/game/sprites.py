@@ -1,144 +1,147 @@
 """Sprite Classes for Player and Enemies"""
 import arcade
-import math
+import numpy as np
 from .constants import (
     RIGHT_FACING, LEFT_FACING, DIRECTION_IDLE, DIRECTION_RIGHT, DIRECTION_LEFT,
     DIRECTION_UP, DIRECTION_DOWN, DIRECTION_UP_RIGHT, DIRECTION_UP_LEFT,
-    DIRECTION_DOWN_RIGHT, DIRECTION_DOWN_LEFT, UPDATES_PER_FRAME
+    DIRECTION_DOWN_RIGHT, DIRECTION_DOWN_LEFT, UPDATES_PER_FRAME, SIMULATION_RATE,
+    PLAYER_CHARACTER, ENEMY_CHARACTER
 )
+from .textures import texture_registry
 
+# (sign of change_x, sign of change_y) -> (direction, facing); a facing of
+# None keeps the current one (moving straight up or down, or standing)
+DIRECTIONS = {
+    (0, 0): (DIRECTION_IDLE, None),
+    (1, 0): (DIRECTION_RIGHT, RIGHT_FACING),
+    (1, 1): (DIRECTION_UP_RIGHT, RIGHT_FACING),
+    (0, 1): (DIRECTION_UP, None),
+    (-1, 1): (DIRECTION_UP_LEFT, LEFT_FACING),
+    (-1, 0): (DIRECTION_LEFT, LEFT_FACING),
+    (-1, -1): (DIRECTION_DOWN_LEFT, LEFT_FACING),
+    (0, -1): (DIRECTION_DOWN, None),
+    (1, -1): (DIRECTION_DOWN_RIGHT, RIGHT_FACING),
+}
 
-def load_texture_pair(filename):
+# DIRECTIONS as a tuple indexed by direction code (see direction_code)
+DIRECTION_TABLE = tuple(DIRECTIONS[code // 3 - 1, code % 3 - 1] for code in range(9))
+IDLE_CODE = 4
+
+
+def direction_code(change_x, change_y):
+    """Direction code of a velocity: (sign(x) + 1) * 3 + sign(y) + 1."""
+    return ((change_x > 0) - (change_x < 0) + 1) * 3 + (change_y > 0) - (change_y < 0) + 1
+
+
+def direction_codes(change_x, change_y):
+    """Vectorized direction_code() over velocity arrays."""
+    return ((np.sign(change_x) + 1) * 3 + np.sign(change_y) + 1).astype(np.intp)
+
+
+class AnimationClock:
     """
-    Load a texture pair. In newer arcade versions, we'd flip the second texture.
-    For compatibility, we load the same texture twice and handle direction via sprite rotation.
+    Walk-cycle frame counter shared by every animated sprite.
+    
+    The game advances it once per frame; sprites only read `frame`, so the
+    animation speed does not depend on how often they are updated.
     """
-    texture = arcade.load_texture(filename)
-    return [texture, texture]
+    
+    def __init__(self, frame_time=UPDATES_PER_FRAME / SIMULATION_RATE):
+        self.frame_time = frame_time
+        self.time = 0.0
+        self.frame = 0
+    
+    def advance(self, delta_time):
+        """
+        Move the clock forward by one rendered frame.
+        
+        Returns:
+            True if the walk frame changed
+        """
+        self.time += delta_time
+        frame = int(self.time / self.frame_time)
+        ticked = frame != self.frame
+        self.frame = frame
+        return ticked
 
 
-class PlayerSprite(arcade.Sprite):
+# Clock shared by the whole game
+animation_clock = AnimationClock()
+
+
+class AnimatedSprite(arcade.Sprite):
     """
-    Custom player sprite with 8-directional animation support.
+    Sprite with idle and 8-frame walking animations.
     
     Animation structure:
     - 2 idle frames (left and right facing)
-    - 16 walking frames (8 directions × 2 frames each)
-    Total: 18 frames
+    - 16 walking frames (8 walk frames × 2 facings)
+    
+    The direction comes from DIRECTION_TABLE and the walk frame from the
+    shared AnimationClock; the texture is only assigned when either changes.
+    Crowds can skip update_animation() and call animate() with direction
+    codes computed in a batch (see DungeonCrawler._update_animations).
     """
     
-    def __init__(self, character_path=":resources:images/animated_characters/female_person/femalePerson", scale=0.4):
+    def __init__(self, character_path, scale=0.4, phase=0, clock=animation_clock):
         super().__init__(scale=scale)
         
-        # Track which direction the character is facing
+        # Track which direction the character is facing and moving
         self.character_face_direction = RIGHT_FACING
-        
-        # Current texture index for animation
-        self.cur_texture = 0
-        
-        # Track current movement direction
         self.current_direction = DIRECTION_IDLE
         
-        # Load textures for idle standing (2 frames: left and right)
-        self.idle_texture_pair = load_texture_pair(f"{character_path}_idle.png")
+        # Walk frames this sprite runs ahead of the shared clock
+        self.phase = phase
+        self.clock = clock
         
-        # Load textures for walking (8 frames × 2 for left/right = 16 frames)
-        self.walk_textures = []
-        for i in range(8):
-            texture = load_texture_pair(f"{character_path}_walk{i}.png")
-            self.walk_textures.append(texture)
+        # Shared idle (2 frames) and walking (8 × 2 frames) textures
+        frames = texture_registry.get_frames(character_path)
+        self.idle_texture_pair = frames.idle_texture_pair
+        self.walk_textures = frames.walk_textures
         
-        # Set the initial texture
-        self.texture = self.idle_texture_pair[0]
+        # Set the initial texture; (walk frame or None when idle, facing)
+        self.texture = self.idle_texture_pair[RIGHT_FACING]
+        self._shown = (None, RIGHT_FACING)
     
     def update_animation(self, delta_time: float = 1/60):
         """Update animation based on movement direction."""
-        # Idle state
-        if self.change_x == 0 and self.change_y == 0:
-            self.current_direction = DIRECTION_IDLE
-            self.texture = self.idle_texture_pair[self.character_face_direction]
+        # One property read: change_x and change_y each go through velocity
+        change_x, change_y = self.velocity
+        self.animate(direction_code(change_x, change_y))
+    
+    def animate(self, code):
+        """Show the texture for a direction code at the clock's current frame."""
+        direction, facing = DIRECTION_TABLE[code]
+        self.current_direction = direction
+        if facing is None:
+            facing = self.character_face_direction
+        else:
+            self.character_face_direction = facing
+        
+        if direction == DIRECTION_IDLE:
+            shown = (None, facing)
+        else:
+            shown = ((self.clock.frame + self.phase) % len(self.walk_textures), facing)
+        if shown == self._shown:
             return
         
-        # Calculate angle of movement for 8-directional detection
-        angle = math.atan2(self.change_y, self.change_x)
-        angle_degrees = math.degrees(angle)
-        
-        # Normalize angle to 0-360 range
-        if angle_degrees < 0:
-            angle_degrees += 360
-        
-        # Determine direction based on angle (8 directions)
-        if 337.5 <= angle_degrees or angle_degrees < 22.5:
-            self.current_direction = DIRECTION_RIGHT
-            self.character_face_direction = RIGHT_FACING
-        elif 22.5 <= angle_degrees < 67.5:
-            self.current_direction = DIRECTION_UP_RIGHT
-            self.character_face_direction = RIGHT_FACING
-        elif 67.5 <= angle_degrees < 112.5:
-            self.current_direction = DIRECTION_UP
-        elif 112.5 <= angle_degrees < 157.5:
-            self.current_direction = DIRECTION_UP_LEFT
-            self.character_face_direction = LEFT_FACING
-        elif 157.5 <= angle_degrees < 202.5:
-            self.current_direction = DIRECTION_LEFT
-            self.character_face_direction = LEFT_FACING
-        elif 202.5 <= angle_degrees < 247.5:
-            self.current_direction = DIRECTION_DOWN_LEFT
-            self.character_face_direction = LEFT_FACING
-        elif 247.5 <= angle_degrees < 292.5:
-            self.current_direction = DIRECTION_DOWN
-        elif 292.5 <= angle_degrees < 337.5:
-            self.current_direction = DIRECTION_DOWN_RIGHT
-            self.character_face_direction = RIGHT_FACING
-        
-        # Walking animation - cycle through frames
-        self.cur_texture += 1
-        if self.cur_texture >= len(self.walk_textures) * UPDATES_PER_FRAME:
-            self.cur_texture = 0
-        
-        frame = self.cur_texture // UPDATES_PER_FRAME
-        self.texture = self.walk_textures[frame][self.character_face_direction]
+        self._shown = shown
+        frame, facing = shown
+        if frame is None:
+            self.texture = self.idle_texture_pair[facing]
+        else:
+            self.texture = self.walk_textures[frame][facing]
 
 
-class EnemySprite(arcade.Sprite):
-    """Animated enemy sprite (zombie)."""
+class PlayerSprite(AnimatedSprite):
+    """Custom player sprite with 8-directional animation support."""
     
-    def __init__(self, character_path=":resources:images/animated_characters/zombie/zombie", scale=0.4):
-        super().__init__(scale=scale)
-        
-        self.character_face_direction = RIGHT_FACING
-        self.cur_texture = 0
-        self.health = 50  # Will be set properly in game logic
-        
-        # Load idle texture
-        self.idle_texture_pair = load_texture_pair(f"{character_path}_idle.png")
-        
-        # Load walking textures
-        self.walk_textures = []
-        for i in range(8):
-            texture = load_texture_pair(f"{character_path}_walk{i}.png")
-            self.walk_textures.append(texture)
-        
-        # Set initial texture
-        self.texture = self.idle_texture_pair[0]
+    def __init__(self, character_path=PLAYER_CHARACTER, scale=0.4):
+        super().__init__(character_path, scale=scale)
+
+
+class EnemySprite(AnimatedSprite):
+    """Animated enemy sprite (zombie)."""
     
-    def update_animation(self, delta_time: float = 1/60):
-        """Update enemy animation."""
-        # Determine facing direction
-        if self.change_x < 0 and self.character_face_direction == RIGHT_FACING:
-            self.character_face_direction = LEFT_FACING
-        elif self.change_x > 0 and self.character_face_direction == LEFT_FACING:
-            self.character_face_direction = RIGHT_FACING
-        
-        # Idle or moving?
-        if self.change_x == 0 and self.change_y == 0:
-            self.texture = self.idle_texture_pair[self.character_face_direction]
-            return
-        
-        # Walking animation
-        self.cur_texture += 1
-        if self.cur_texture >= len(self.walk_textures) * UPDATES_PER_FRAME:
-            self.cur_texture = 0
-        
-        frame = self.cur_texture // UPDATES_PER_FRAME
-        self.texture = self.walk_textures[frame][self.character_face_direction]
+    def __init__(self, character_path=ENEMY_CHARACTER, scale=0.4, phase=0):
+        super().__init__(character_path, scale=scale, phase=phase)
@@ -0,0 +1,170 @@
+"""Static Wall Layer baked into one texture per chunk"""
+import itertools
+import math
+
+import arcade
+import numpy as np
+import PIL.Image
+
+from .constants import TILE_SIZE, WALL_TEXTURE, WALL_BAKES_PER_FRAME
+from .textures import texture_registry
+
+
+class StaticWallLayer:
+    """
+    Walls pre-rendered into one tile-map texture per chunk.
+    
+    Walls never move, so there is no reason to keep hundreds of sprites
+    around for them. build() groups the walls of a level by chunk; show()
+    bakes the chunks in and around the view into one image each (pasting
+    every wall tile once) and drops chunks that scrolled away, so draw()
+    costs the same for 10 walls or a map of millions.
+    
+    The chunk images live in the layer's own texture atlas, in one slot per
+    chunk that can be near the view at once. A bake repaints a free slot in
+    place and a dropped chunk hands its slot back, so texture memory only
+    covers the chunks around the camera and scrolling never grows or
+    rebuilds the atlas.
+    """
+    
+    _slot_ids = itertools.count()
+    
+    def __init__(self, tile_path=WALL_TEXTURE):
+        self.tile_path = tile_path
+        self.tile = None
+        self.sprite_list = None
+        self.chunks = None
+        self.wall_count = 0
+        self.chunk_walls = {}
+        self.baked = {}
+        self.free_slots = []
+        self.bakes = 0  # Chunk textures rendered, for profiling
+    
+    def build(self, wall_positions, chunks, view_size):
+        """
+        Group the walls of a new level by chunk. Call this only when the level changes.
+        
+        Args:
+            wall_positions: (xs, ys) arrays of wall centers in pixels
+            chunks: ChunkGrid of the level
+            view_size: (width, height) of the camera view in pixels
+        """
+        if self.sprite_list is None:
+            self._create_atlas(chunks.chunk_size, view_size)
+        for sprite in self.baked.values():
+            self._release(sprite)
+        self.baked = {}
+        self.chunks = chunks
+        xs, ys = wall_positions
+        self.wall_count = len(xs)
+        
+        self.chunk_walls = {}
+        if not self.wall_count:
+            return
+        # Sort the walls by chunk once, then slice out each chunk's run
+        cols, rows = chunks.chunks_of(xs, ys)
+        order = np.lexsort((rows, cols))
+        xs, ys, cols, rows = xs[order], ys[order], cols[order], rows[order]
+        starts = np.flatnonzero((np.diff(cols) != 0) | (np.diff(rows) != 0)) + 1
+        bounds = [0] + starts.tolist() + [self.wall_count]
+        for start, end in zip(bounds, bounds[1:]):
+            key = (int(cols[start]), int(rows[start]))
+            self.chunk_walls[key] = (xs[start:end], ys[start:end])
+    
+    def show(self, left, bottom, right, top):
+        """
+        Bake the chunks in and around the view and drop the ones far from it.
+        
+        Chunks in view are baked at once. Chunks within half a chunk of the
+        view are baked ahead, WALL_BAKES_PER_FRAME per call, nearest first,
+        and kept while baked, so scrolling into a chunk or back and forth
+        over a chunk edge rarely bakes on the spot.
+        
+        Args:
+            left, bottom, right, top: Camera view in pixels
+        """
+        chunks = self.chunks
+        margin = chunks.chunk_size / 2
+        visible = chunks.chunks_in_rect(left, bottom, right, top)
+        keep = set(chunks.chunks_in_rect(left - margin, bottom - margin, right + margin, top + margin))
+        for key in list(self.baked):
+            if key not in keep:
+                self._release(self.baked.pop(key))
+        
+        for key in visible:
+            if key not in self.baked and key in self.chunk_walls:
+                self._bake(key)
+        
+        ahead = [key for key in keep if key not in self.baked and key in self.chunk_walls]
+        if ahead:
+            size = chunks.chunk_size
+            center_x, center_y = (left + right) / 2, (bottom + top) / 2
+            ahead.sort(key=lambda key: abs((key[0] + 0.5) * size - center_x)
+                       + abs((key[1] + 0.5) * size - center_y))
+            for key in ahead[:WALL_BAKES_PER_FRAME]:
+                self._bake(key)
+    
+    def _create_atlas(self, chunk_size, view_size):
+        """Create the atlas with a slot for every chunk that can be kept at once."""
+        # Slots reach half a tile past the chunk, for walls on its edges
+        side = chunk_size + TILE_SIZE
+        # The kept area spans the view plus a chunk; a span of n pixels
+        # touches at most ceil(n / chunk_size) + 1 chunks
+        across = math.ceil(view_size[0] / chunk_size) + 2
+        down = math.ceil(view_size[1] / chunk_size) + 2
+        border = 2
+        atlas = arcade.DefaultTextureAtlas(
+            (across * (side + 2 * border), down * (side + 2 * border)), border=border
+        )
+        self.sprite_list = arcade.SpriteList(atlas=atlas, capacity=across * down)
+        for _ in range(across * down):
+            self.free_slots.append(self._new_slot(side))
+    
+    def _new_slot(self, side):
+        """A transparent chunk sprite with its own texture in the atlas."""
+        texture = arcade.Texture(
+            PIL.Image.new("RGBA", (side, side), (0, 0, 0, 0)),
+            hit_box_algorithm=arcade.hitbox.algo_bounding_box,
+            hash=f"static-wall-layer-slot-{next(self._slot_ids)}",
+        )
+        self.sprite_list.atlas.add(texture)
+        return arcade.Sprite(texture)
+    
+    def _release(self, sprite):
+        """Stop drawing a baked chunk and make its slot free again."""
+        self.sprite_list.remove(sprite)
+        self.free_slots.append(sprite)
+    
+    def _bake(self, key):
+        """Render one chunk's walls into a free slot and draw it."""
+        size = self.chunks.chunk_size
+        half = TILE_SIZE // 2
+        if self.tile is None:
+            tile = texture_registry.get_texture(self.tile_path).image.convert("RGBA")
+            self.tile = tile.resize((TILE_SIZE, TILE_SIZE))
+        # A window grown since the atlas was sized can keep more chunks
+        sprite = self.free_slots.pop() if self.free_slots else self._new_slot(size + TILE_SIZE)
+        
+        # Image rows run top-down, world y runs bottom-up
+        col, row = key
+        left = col * size - half
+        top = (row + 1) * size + half
+        texture = sprite.texture
+        image = texture.image
+        image.paste((0, 0, 0, 0), (0, 0) + image.size)
+        xs, ys = self.chunk_walls[key]
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            image.paste(self.tile, (int(x) - half - left, top - (int(y) + half)))
+        
+        atlas = self.sprite_list.atlas
+        region = atlas.get_image_region_info(texture.image_data.hash)
+        atlas.write_image(image, region.x - atlas.border, region.y - atlas.border)
+        sprite.center_x = (col + 0.5) * size
+        sprite.center_y = (row + 0.5) * size
+        self.sprite_list.append(sprite)
+        self.baked[key] = sprite
+        self.bakes += 1
+    
+    def draw(self):
+        """Draw the baked chunks, one sprite each."""
+        self.sprite_list.draw()
@@ -0,0 +1,61 @@
+"""Cached Text Labels"""
+import arcade
+import pyglet
+
+
+class TextCache:
+    """
+    Persistent arcade.Text labels drawn as one batch.
+    
+    text() takes the same arguments as arcade.draw_text plus a key. A label
+    is only laid out again when one of its arguments changes, and labels
+    not requested since the last draw() are hidden.
+    """
+    
+    def __init__(self):
+        self.batch = pyglet.graphics.Batch()
+        self.labels = {}
+        self._args = {}
+        self._used = set()
+        self.layouts = 0  # Labels created or changed, for profiling
+    
+    def text(self, key, text, x, y, color, font_size, anchor_x="left", bold=False):
+        """Show a label this frame, updating it only if something changed."""
+        args = (text, x, y, color, font_size, anchor_x, bold)
+        label = self.labels.get(key)
+        if label is None:
+            label = arcade.Text(
+                text, x, y, color, font_size,
+                anchor_x=anchor_x, bold=bold, batch=self.batch
+            )
+            self.labels[key] = label
+            self.layouts += 1
+        elif self._args[key] != args:
+            old_text, old_x, old_y, old_color, old_size, old_anchor, old_bold = self._args[key]
+            if text != old_text:
+                label.text = text
+            if (x, y) != (old_x, old_y):
+                label.position = (x, y)
+            if color != old_color:
+                label.color = color
+            if font_size != old_size:
+                label.font_size = font_size
+            if anchor_x != old_anchor:
+                label.anchor_x = anchor_x
+            if bold != old_bold:
+                label.bold = bold
+            self.layouts += 1
+        self._args[key] = args
+        
+        if not label.visible:
+            label.visible = True
+        self._used.add(key)
+        return label
+    
+    def draw(self):
+        """Draw every label requested since the last draw in one batch."""
+        for key, label in self.labels.items():
+            if key not in self._used and label.visible:
+                label.visible = False
+        self._used.clear()
+        self.batch.draw()
@@ -0,0 +1,136 @@
+"""Shared Texture Registry"""
+import threading
+
+import arcade
+
+
+def load_texture_pair(filename, load=arcade.load_texture):
+    """
+    Load a texture pair. In newer arcade versions, we'd flip the second texture.
+    For compatibility, we load the same texture twice and handle direction via sprite rotation.
+    """
+    texture = load(filename)
+    return [texture, texture]
+
+
+def character_files(character_path):
+    """Image files of a character: the idle frame, then the 8 walk frames."""
+    return [f"{character_path}_idle.png"] + [f"{character_path}_walk{i}.png" for i in range(8)]
+
+
+class CharacterFrames:
+    """Animation frames of one character, shared by every sprite using it."""
+    
+    def __init__(self, character_path, load=arcade.load_texture):
+        idle, *walk = character_files(character_path)
+        
+        # Idle standing (2 frames: left and right)
+        self.idle_texture_pair = load_texture_pair(idle, load)
+        
+        # Walking (8 frames × 2 for left/right = 16 frames)
+        self.walk_textures = [load_texture_pair(filename, load) for filename in walk]
+
+
+class TextureRegistry:
+    """
+    Process-wide cache of textures and character frame tables.
+    
+    Everything is loaded from disk once; later lookups hand out the same
+    objects. The hit/miss counters show whether a restart touched the disk:
+    a miss is one arcade.load_texture() call, a hit is a texture or frame
+    table lookup served from the cache.
+    """
+    
+    def __init__(self):
+        self._characters = {}
+        self._textures = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get_frames(self, character_path):
+        """Shared CharacterFrames for a character path prefix."""
+        frames = self._characters.get(character_path)
+        if frames is None:
+            # Not a miss by itself: each frame lookup counts as a hit or a miss
+            frames = self._characters[character_path] = CharacterFrames(character_path, self.get_texture)
+        else:
+            self.hits += 1
+        return frames
+    
+    def get_texture(self, texture_path):
+        """Shared texture for an image path."""
+        texture = self._textures.get(texture_path)
+        if texture is None:
+            self.misses += 1
+            texture = self._textures[texture_path] = arcade.load_texture(texture_path)
+        else:
+            self.hits += 1
+        return texture
+    
+    def upload(self, atlas):
+        """Add every loaded texture to a texture atlas (needs the GL context)."""
+        for texture in self._textures.values():
+            atlas.add(texture)
+    
+    def stats(self):
+        """Hit and miss counters (a miss is one texture loaded from disk)."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+# Registry shared by the whole game
+texture_registry = TextureRegistry()
+
+
+class AssetLoader:
+    """
+    Loads textures into a TextureRegistry on a background thread.
+    
+    Decoding images and computing their hit boxes needs no GL context, so
+    the window keeps drawing (a loading screen) meanwhile. Poll `progress`
+    and done() each frame, or wait() to block; errors from the thread are
+    raised again by both.
+    """
+    
+    def __init__(self, registry, characters=(), textures=()):
+        self.registry = registry
+        self.characters = list(characters)
+        self.files = [filename for path in self.characters for filename in character_files(path)]
+        self.files += textures
+        self.loaded = 0
+        self.error = None
+        self._done = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="asset-loader", daemon=True)
+    
+    def start(self):
+        """Start loading; returns self."""
+        self.thread.start()
+        return self
+    
+    @property
+    def progress(self):
+        """Fraction of the files loaded so far."""
+        return self.loaded / len(self.files) if self.files else 1.0
+    
+    def _run(self):
+        try:
+            for filename in self.files:
+                self.registry.get_texture(filename)
+                self.loaded += 1
+            # Every frame is cached by now; this only builds the tables
+            for character_path in self.characters:
+                self.registry.get_frames(character_path)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+    
+    def done(self):
+        """True once everything is loaded."""
+        if self.error:
+            raise self.error
+        return self._done.is_set()
+    
+    def wait(self):
+        """Block until everything is loaded."""
+        self._done.wait()
+        return self.done()
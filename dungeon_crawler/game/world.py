@@ -0,0 +1,432 @@
+"""Headless Game Simulation (no arcade.Window required)"""
+import math
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from .constants import (
+    TILE_SIZE, MAP_SIZES, ENTITY_COUNTS, DEFAULT_MAP_SIZE, PLAYER_SPEED, ENEMY_SPEED,
+    PLAYER_HEALTH, ATTACK_DAMAGE, ATTACK_COOLDOWN, SPEED_SCALE, AI_LOD_TIERS, AI_UPDATE_BUDGET,
+    PLAYER_HITBOX, ENEMY_HITBOX, COIN_HITBOX, MAZE_ALGORITHM
+)
+from .maze_generator import Maze, MazeGenerator
+from .collision import TileCollider
+from .pathfinding import FlowField
+from .enemy_store import EnemyStore
+from .chunks import ChunkGrid
+from .profiler import FrameProfiler
+
+
+# Player start: center of the first open tile
+PLAYER_START = (TILE_SIZE + TILE_SIZE // 2, TILE_SIZE + TILE_SIZE // 2)
+
+# Everything random about a level, in a compact picklable form: the maze
+# cells as bytes and the coin/enemy spawn positions as (n, 2) arrays
+Level = namedtuple(
+    'Level',
+    'map_size seed algorithm coin_count enemy_count maze_width maze_height cells coins enemies'
+)
+
+
+# AI_LOD_TIERS as arrays
+AI_TIER_DISTANCES = np.array([distance for distance, _ in AI_LOD_TIERS], dtype=np.float64)
+AI_TIER_INTERVALS = np.array([interval for _, interval in AI_LOD_TIERS], dtype=np.int64)
+
+
+class Body:
+    """
+    Axis-aligned box positioned by its center, like arcade.Sprite.
+    
+    Bodies carry no textures, so the simulation can run on machines
+    without a display.
+    """
+    
+    def __init__(self, center_x=0.0, center_y=0.0, size=(0, 0)):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.width, self.height = size
+        self.change_x = 0.0
+        self.change_y = 0.0
+    
+    @property
+    def left(self):
+        return self.center_x - self.width / 2
+    
+    @property
+    def right(self):
+        return self.center_x + self.width / 2
+    
+    @property
+    def bottom(self):
+        return self.center_y - self.height / 2
+    
+    @property
+    def top(self):
+        return self.center_y + self.height / 2
+    
+    def collides_with(self, other):
+        """Check if the two boxes overlap (touching edges do not count)."""
+        return (abs(self.center_x - other.center_x) * 2 < self.width + other.width and
+                abs(self.center_y - other.center_y) * 2 < self.height + other.height)
+    
+    def collides_with_list(self, bodies):
+        """Return every body in the list that overlaps this one."""
+        return [body for body in bodies if self.collides_with(body)]
+
+
+class World:
+    """
+    Window-free game simulation.
+    
+    Owns the player, enemies, coins, walls, score and health. A renderer
+    (see DungeonCrawler in main.py) reads the bodies after each step and
+    feeds player input back through set_movement() and attack().
+    """
+    
+    def __init__(self, map_size=DEFAULT_MAP_SIZE, profiler=None, coin_count=None, enemy_count=None,
+                 seed=None, algorithm=MAZE_ALGORITHM):
+        """
+        Args:
+            map_size: Key of MAP_SIZES
+            profiler: FrameProfiler for step() timings (a private one if None)
+            coin_count: Coins per level (None = default for the map size)
+            enemy_count: Enemies per level (None = default for the map size)
+            seed: Seed of the level's random generator (None = pick one)
+            algorithm: Maze algorithm (see MazeGenerator.ALGORITHMS)
+        """
+        self.map_size = map_size
+        self.map_width, self.map_height = MAP_SIZES[map_size]
+        
+        # Every random choice of a level comes from one generator seeded
+        # with this, so the same seed always builds the same level
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.algorithm = algorithm
+        
+        # Default entity counts depend on the map size preset
+        default_coins, default_enemies = ENTITY_COUNTS[map_size]
+        self.coin_count = default_coins if coin_count is None else coin_count
+        self.enemy_count = default_enemies if enemy_count is None else enemy_count
+        
+        # Drawing works per chunk; AI runs in tiers around the player, and
+        # the enemies of the every-tick tier are the active ones
+        self.chunks = ChunkGrid(self.map_width, self.map_height)
+        self.active_slots = np.empty(0, dtype=np.intp)
+        
+        # Stage timings of step() (shared with the renderer when it passes one)
+        self.profiler = profiler or FrameProfiler()
+        
+        # Game objects
+        self.player = None
+        self.maze = None
+        self.wall_positions = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))  # (xs, ys)
+        self.collider = None
+        self.flow_field = None
+        self.coins = []
+        self.enemies = EnemyStore()
+        
+        # Game stats
+        self.score = 0
+        self.player_health = PLAYER_HEALTH
+        self.attack_cooldown_timer = 0
+        self.game_over = False
+        self.won = False
+        # Simulated seconds and ticks since setup()
+        self.elapsed = 0.0
+        self.ticks = 0
+        
+        # Bodies removed since the renderer last asked (collected/killed)
+        self._removed = []
+        
+        # Input applied since the last step, and who wants to know about it
+        self.movement = (0, 0)
+        self.attacked = False
+        self.recorder = None
+    
+    def setup(self, level=None):
+        """
+        Build a fresh level. Call this function to start/restart the game.
+        
+        Args:
+            level: Pregenerated Level to play (default: generate one from the seed)
+        """
+        map_width, map_height = self.map_width, self.map_height
+        
+        # Reset game state
+        self.score = 0
+        self.player_health = PLAYER_HEALTH
+        self.attack_cooldown_timer = 0
+        self.game_over = False
+        self.won = False
+        self.elapsed = 0.0
+        self.ticks = 0
+        self._removed = []
+        self.attacked = False
+        
+        # Create player
+        self.player = Body(*PLAYER_START, PLAYER_HITBOX)
+        
+        if level is None:
+            level = self.generate_level()
+        self.seed = level.seed
+        
+        # Maze obstacles; the border walls only bound the play area
+        self.maze = Maze(level.maze_width, level.maze_height, bytearray(level.cells))
+        half = TILE_SIZE / 2
+        self.collider = TileCollider(self.maze, (half, half, map_width - half, map_height - half))
+        self.flow_field = FlowField(self.maze)
+        
+        # Wall positions for drawing
+        border_xs, border_ys = self._border_wall_positions()
+        maze_xs, maze_ys = self.maze.wall_positions()
+        self.wall_positions = (np.concatenate((border_xs, maze_xs)),
+                               np.concatenate((border_ys, maze_ys)))
+        
+        # Create coins
+        self.coins = [Body(x, y, COIN_HITBOX) for x, y in level.coins.tolist()]
+        
+        # Create enemies
+        self.enemies = EnemyStore()
+        for x, y in level.enemies.tolist():
+            self.enemies.add(x, y)
+    
+    def generate_level(self):
+        """
+        Generate the maze and spawn positions for this world's seed.
+        
+        Needs no other World state, so pregeneration workers can call it
+        (see pregen.py).
+        
+        Returns:
+            Level
+        """
+        rng = random.Random(self.seed)
+        maze = MazeGenerator.generate(
+            self.map_width, self.map_height, *PLAYER_START, rng, self.algorithm
+        )
+        
+        # Index of open floor cells (the maze grid covers all of the floor),
+        # sampled directly for placement
+        free_cells = np.flatnonzero(np.frombuffer(maze.cells, dtype=np.uint8) == 0)
+        coins = self._spawn_positions(maze, free_cells, self.coin_count, TILE_SIZE * 3, COIN_HITBOX, rng)
+        enemies = self._spawn_positions(maze, free_cells, self.enemy_count, TILE_SIZE * 5, ENEMY_HITBOX, rng)
+        return Level(
+            self.map_size, self.seed, self.algorithm, self.coin_count, self.enemy_count,
+            maze.width, maze.height, bytes(maze.cells), coins, enemies
+        )
+    
+    @staticmethod
+    def _spawn_positions(maze, free_cells, count, min_distance, hitbox, rng):
+        """
+        Pick open floor positions at least min_distance away from the player start.
+        
+        Entities get cell centers while there are enough eligible cells.
+        Past that, each cell offers one spot per quarter instead (moved in
+        so the hitbox stays inside the cell), so no two entities share a
+        position; a count beyond that is capped.
+        
+        Args:
+            maze: Maze to place on
+            free_cells: Flat indices of the open cells
+            count: Number of entities wanted
+            min_distance: Distance to keep from the player start in pixels
+            hitbox: (width, height) of the entities
+            rng: random.Random to draw from
+        
+        Returns:
+            (n, 2) array of x, y positions, n = min(count, 4 * eligible cells)
+        """
+        rows, cols = np.divmod(free_cells, maze.width)
+        xs = maze.offset_x + cols * maze.tile_size
+        ys = maze.offset_y + rows * maze.tile_size
+        start_x, start_y = PLAYER_START
+        far_enough = np.hypot(xs - start_x, ys - start_y) >= min_distance
+        xs, ys = xs[far_enough], ys[far_enough]
+        
+        if count > len(xs):
+            shift_x = min(maze.tile_size / 4, (maze.tile_size - hitbox[0]) / 2)
+            shift_y = min(maze.tile_size / 4, (maze.tile_size - hitbox[1]) / 2)
+            quarters = ((-shift_x, -shift_y), (shift_x, -shift_y), (-shift_x, shift_y), (shift_x, shift_y))
+            xs = np.concatenate([xs + dx for dx, _ in quarters])
+            ys = np.concatenate([ys + dy for _, dy in quarters])
+        picks = rng.sample(range(len(xs)), min(count, len(xs)))
+        return np.column_stack((xs[picks], ys[picks])).astype(np.float64)
+    
+    def _border_wall_positions(self):
+        """Positions of the border walls around the play area as (xs, ys) arrays."""
+        # Top and bottom walls
+        across = np.arange(0, self.map_width + TILE_SIZE, TILE_SIZE)
+        # Left and right walls
+        up = np.arange(TILE_SIZE, self.map_height, TILE_SIZE)
+        xs = np.concatenate((across, across, np.zeros_like(up), np.full_like(up, self.map_width)))
+        ys = np.concatenate((np.zeros_like(across), np.full_like(across, self.map_height), up, up))
+        return xs, ys
+    
+    def set_movement(self, dx, dy):
+        """
+        Set player velocity from an input direction with normalized diagonal speed.
+        
+        Args:
+            dx: -1 (left), 0 or 1 (right)
+            dy: -1 (down), 0 or 1 (up)
+        """
+        self.movement = (dx, dy)
+        speed = PLAYER_SPEED * SPEED_SCALE
+        self.player.change_x = dx * speed
+        self.player.change_y = dy * speed
+        
+        # Normalize diagonal movement
+        if dx != 0 and dy != 0:
+            magnitude = math.sqrt(dx ** 2 + dy ** 2)
+            self.player.change_x = (dx / magnitude) * speed
+            self.player.change_y = (dy / magnitude) * speed
+    
+    def attack(self):
+        """Player attacks nearby enemies."""
+        self.attacked = True
+        if self.attack_cooldown_timer > 0:
+            return
+        
+        self.attack_cooldown_timer = ATTACK_COOLDOWN
+        
+        attack_range = TILE_SIZE * 1.5
+        in_range = self.enemies.within(self.player.center_x, self.player.center_y, attack_range)
+        killed = self.enemies.damage(in_range, ATTACK_DAMAGE)
+        self.score += 50 * len(killed)
+        self._removed.extend(killed)
+        # Kills refill slots, so the active slots must be looked up again
+        if killed:
+            self._update_tiers()
+    
+    def pop_removed(self):
+        """Return bodies collected or killed since the last call, and forget them."""
+        removed, self._removed = self._removed, []
+        return removed
+    
+    def _update_tiers(self):
+        """
+        Sort enemies into AI_LOD_TIERS by their distance to the player.
+        
+        Returns:
+            (slots, tiers) of the enemies in any tier; dormant ones are left
+            out. Slots of the first tier are also kept in active_slots.
+        """
+        enemies = self.enemies
+        n = enemies.count
+        player = self.player
+        distance = np.maximum(np.abs(enemies.x[:n] - player.center_x),
+                              np.abs(enemies.y[:n] - player.center_y))
+        # One pass over every enemy; the rest only looks at the nearby ones
+        slots = np.flatnonzero(distance <= AI_TIER_DISTANCES[-1])
+        tiers = np.searchsorted(AI_TIER_DISTANCES, distance[slots])
+        self.active_slots = slots[tiers == 0]
+        return slots, tiers
+    
+    def _schedule_ai(self):
+        """
+        Point the flow field at the player and pick the enemies that move this tick.
+        
+        Tiers with an interval of 1 run every tick. Farther tiers run once
+        every `interval` ticks, staggered by slot, and cover the ticks they
+        skipped in one larger step. At most AI_UPDATE_BUDGET of those run
+        per tick, longest waiting first; the rest wait for their next turn.
+        
+        Returns:
+            (slots, ticks): slots to update, and the ticks each one covers
+        """
+        player = self.player
+        reach = AI_TIER_DISTANCES[-1]
+        min_col, min_row = self.maze.cell_at(player.center_x - reach, player.center_y - reach)
+        max_col, max_row = self.maze.cell_at(player.center_x + reach, player.center_y + reach)
+        self.flow_field.update(
+            *self.maze.cell_at(player.center_x, player.center_y),
+            bounds=(min_col, min_row, max_col, max_row)
+        )
+        
+        near, tiers = self._update_tiers()
+        intervals = AI_TIER_INTERVALS[tiers]
+        tick = self.ticks
+        last = self.enemies.ai_tick
+        # An interval of 1 is always due
+        due = (near + tick) % intervals == 0
+        staggered = np.flatnonzero(due & (intervals > 1))
+        if len(staggered) > AI_UPDATE_BUDGET:
+            waiting = np.argsort(last[near[staggered]], kind='stable')
+            due[staggered[waiting[AI_UPDATE_BUDGET:]]] = False
+        
+        slots = near[due]
+        # Enemies waking from dormancy catch up at most one interval
+        ticks = np.clip(tick - last[slots], 1, intervals[due])
+        last[slots] = tick
+        return slots, ticks
+    
+    def step(self, delta_time):
+        """
+        Advance the simulation by one tick.
+        
+        Movement is per tick, so the game runs at its intended speed when
+        called with FIXED_TIMESTEP (see DungeonCrawler.on_update).
+        """
+        if self.game_over:
+            return
+        
+        # Log this tick's input before it is consumed (see replay.py)
+        if self.recorder:
+            dx, dy = self.movement
+            self.recorder.record(delta_time, dx, dy, self.attacked)
+        self.attacked = False
+        self.elapsed += delta_time
+        self.ticks += 1
+        
+        self.collider.reset_counters()
+        
+        # Update attack cooldown
+        if self.attack_cooldown_timer > 0:
+            self.attack_cooldown_timer -= delta_time
+        
+        profiler = self.profiler
+        
+        # Update physics
+        with profiler.stage('physics'):
+            self.collider.move(self.player)
+        
+        # Enemy AI: follow the flow field toward the player's cell. The
+        # field is only rebuilt when the player crosses a cell boundary,
+        # and only covers the AI tiers around the player. Far tiers move
+        # less often in bigger steps; enemies beyond them are dormant.
+        # Enemies in the player's cell, or with no path, head straight for
+        # the player.
+        enemies = self.enemies
+        with profiler.stage('ai'):
+            slots, ticks = self._schedule_ai()
+            target_x, target_y = self.flow_field.next_steps(
+                enemies.x[slots], enemies.y[slots],
+                self.player.center_x, self.player.center_y
+            )
+            enemies.steer(target_x, target_y, ENEMY_SPEED * SPEED_SCALE * ticks, slots)
+        
+        with profiler.stage('enemy_physics'):
+            self.collider.move_many(enemies, *ENEMY_HITBOX, slots)
+            enemies.reindex()
+        
+        # Coin collection
+        with profiler.stage('collisions'):
+            for coin in self.player.collides_with_list(self.coins):
+                self.coins.remove(coin)
+                self._removed.append(coin)
+                self.score += 10
+            enemy_hits = self.enemies.count_overlapping(self.player)
+        
+        # Enemy collision damage
+        if enemy_hits:
+            self.player_health -= 5 * delta_time * enemy_hits
+            
+            if self.player_health <= 0:
+                self.player_health = 0
+                self.game_over = True
+                return
+        
+        # Win condition
+        if len(self.coins) == 0:
+            self.game_over = True
+            self.won = True
@@ -2,15 +2,38 @@
 Dungeon Crawler Game - Main Entry Point
 Modular version with clean code organization
 """
+import time
+
+# Reference point of the startup timings, taken before the imports below
+STARTED = time.perf_counter()
+
+import argparse
+import json
+
 import arcade
-import random
-import math
+import numpy as np
 
-from game.constants import *
-from game.sprites import PlayerSprite, EnemySprite
+from game.constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, TILE_SIZE, MAP_SIZES, DEFAULT_MAP_SIZE,
+    PLAYER_CHARACTER, ENEMY_CHARACTER, COIN_TEXTURE, WALL_TEXTURE, FIXED_TIMESTEP,
+    MAX_STEPS_PER_FRAME, FRAME_RATE, IDLE_FRAME_RATE, STATIC_WALL_LAYER, MAZE_ALGORITHM, LEADERBOARD_PAGE_SIZE,
+    PROFILE_HISTORY, PROFILE_EXPORT, STATE_MENU, STATE_SETTINGS, STATE_HIGHSCORE,
+    STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER, STATE_MAP_SIZE, STATE_LOADING, STATIC_STATES
+)
+from game.sprites import PlayerSprite, EnemySprite, animation_clock, direction_codes, IDLE_CODE
+from game.world import World
 from game.maze_generator import MazeGenerator
-from game.highscore import HighscoreManager
+from game.static_layer import StaticWallLayer
+from game.textures import texture_registry, AssetLoader
+from game.text_cache import TextCache
+from game.health_bars import HealthBarLayer
+from game.profiler import FrameProfiler
 from game.menu import MenuRenderer
+from game.screen_cache import ScreenCache
+# Worker processes, the level cache, the leaderboard and replays are
+# imported where first used, after the window is up
+
+IMPORTED = time.perf_counter()
 
 
 class DungeonCrawler(arcade.Window):
@@ -19,26 +42,73 @@ class DungeonCrawler(arcade.Window):
     def __init__(self):
         # Start with default map size
         self.current_map_size = DEFAULT_MAP_SIZE
-        map_width, map_height = MAP_SIZES[self.current_map_size]
-        
-        super().__init__(map_width, map_height, SCREEN_TITLE, resizable=True)
         
-        # Game state
-        self.current_state = STATE_MENU
+        super().__init__(
+            SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE, resizable=True,
+            update_rate=1 / FRAME_RATE, draw_rate=1 / FRAME_RATE
+        )
         
-        # Game objects
+        # Scrolls over the map following the player; HUD and menus are
+        # drawn with the window's default camera
+        self.camera = arcade.Camera2D()
+        
+        # Static screens are drawn once and then copied from here, at
+        # IDLE_FRAME_RATE (see the current_state setter)
+        self.screen_cache = ScreenCache(self.ctx)
+        self.frame_rate = FRAME_RATE
+        
+        # Game state; the menu opens once the assets are loaded
+        self.current_state = STATE_LOADING
+        
+        # Seconds from STARTED to the end of the imports, the first drawn
+        # frame and the open menu (time-to-playable), filled in as reached
+        self.startup_times = {'imports': IMPORTED - STARTED}
+        # Quit as soon as the game is playable (--time-startup)
+        self.exit_when_playable = False
+        
+        # Simulation (score, health and all bodies live here)
+        self.world = None
+        # Fixed-timestep loop: time not yet simulated, and the player and
+        # enemy positions before the last step for interpolated drawing
+        self.accumulator = 0.0
+        self.previous_player = (0.0, 0.0)
+        self.previous_enemies = (np.empty(0), np.empty(0))
+        
+        # Extra World arguments, e.g. entity counts set by the benchmark
+        self.world_options = {}
+        # Logs every game's input when set (--record)
+        self.recorder = None
+        
+        # Next levels are generated in worker processes while the player is
+        # in the menus or playing; levels of fixed seeds are loaded from disk
+        # after their first game. Both are created when loading finishes.
+        self.pregenerator = None
+        self.level_cache = None
+        
+        # Sprites mirroring the simulation
         self.player_sprite = None
+        # Direction code each enemy sprite last animated with, by store slot
+        # (-1 = not animated yet)
+        self.animation_codes = np.empty(0, dtype=np.intp)
         self.player_list = None
         self.walls = None
-        self.coins = None
+        self.coin_chunks = {}
         self.enemies = None
-        self.enemy_physics_engines = []
+        self.body_sprites = {}
+        
+        # Load every texture once, in the background behind the loading
+        # screen; restarts reuse the shared frame tables
+        self.asset_loader = AssetLoader(
+            texture_registry,
+            characters=(PLAYER_CHARACTER, ENEMY_CHARACTER),
+            textures=(COIN_TEXTURE, WALL_TEXTURE)
+        ).start()
         
-        # Game stats
-        self.score = 0
-        self.player_health = PLAYER_HEALTH
-        self.physics_engine = None
-        self.attack_cooldown_timer = 0
+        # Walls never move: bake them once per level
+        self.wall_layer = StaticWallLayer()
+        
+        # Enemy health bars drawn as one batch
+        self.health_bars = HealthBarLayer()
         
         # Track key states for 8-directional movement
         self.up_pressed = False
@@ -46,153 +116,242 @@ class DungeonCrawler(arcade.Window):
         self.left_pressed = False
         self.right_pressed = False
         
-        # Highscores with persistence
-        self.highscore_manager = HighscoreManager()
+        # Highscores with persistence (opened when loading finishes)
+        self.highscore_manager = None
+        # Highscore screen: map size shown (None = all), current page and
+        # its (entries, page count), queried only when the page changes
+        self.highscore_map_size = None
+        self.highscore_page = 0
+        self.highscore_entries = ([], 1)
+        # (rank, percentile) of the last finished game on its map size
+        self.game_over_rank = (None, None)
+        # Leaderboard queries running on the writer thread (Futures of the
+        # two values above, None when nothing is pending)
+        self.page_query = None
+        self.standing_query = None
         
         # Menu renderer
         self.menu_renderer = MenuRenderer()
         
+        # HUD labels, re-laid out only when their values change
+        self.hud_texts = TextCache()
+        
+        # Per-stage frame timings, shown with F3
+        self.profiler = FrameProfiler(PROFILE_HISTORY)
+        self.show_profiler = False
+        self.profiler_texts = TextCache()
+        self.profiler_lines = []
+        self.profiler_frames = 0
+        
         arcade.set_background_color(arcade.color.DARK_GRAY)
     
+    @property
+    def current_state(self):
+        """Screen shown (one of the STATE_ constants)."""
+        return self._current_state
+    
+    @current_state.setter
+    def current_state(self, state):
+        self._current_state = state
+        self.screen_cache.invalidate()
+        # Nothing moves on static screens: update and draw less often
+        frame_rate = IDLE_FRAME_RATE if state in STATIC_STATES else FRAME_RATE
+        if frame_rate != self.frame_rate:
+            self.frame_rate = frame_rate
+            # The update rate first: the draw rate may not be faster
+            self.set_update_rate(1 / frame_rate)
+            self.set_draw_rate(1 / frame_rate)
+    
+    def wait_for_assets(self):
+        """Block until loading is done, instead of showing the loading screen."""
+        self.asset_loader.wait()
+        if self.current_state == STATE_LOADING:
+            self._finish_loading()
+    
+    def _finish_loading(self):
+        """Upload the loaded textures and open the subsystems the menus need."""
+        from game.highscore import HighscoreManager
+        from game.level_cache import LevelCache
+        from game.pregen import LevelPregenerator
+        
+        texture_registry.upload(self.ctx.default_atlas)
+        if self.pregenerator is None:
+            self.pregenerator = LevelPregenerator()
+        if self.level_cache is None:
+            self.level_cache = LevelCache()
+        if self.highscore_manager is None:
+            self.highscore_manager = HighscoreManager()
+        self.current_state = STATE_MENU
+    
+    def _startup_reached(self, name):
+        """Record a startup milestone in seconds since STARTED."""
+        seconds = time.perf_counter() - STARTED
+        self.startup_times[name] = seconds
+        self.profiler.record(f'startup_{name}', seconds)
+    
     def setup(self):
         """Set up the game. Call this function to start/restart the game."""
-        # Get current map dimensions
-        map_width, map_height = MAP_SIZES[self.current_map_size]
-        
-        # Resize window if needed
-        if self.width != map_width or self.height != map_height:
-            self.set_size(map_width, map_height)
-        
-        # Reset game state
-        self.score = 0
-        self.player_health = PLAYER_HEALTH
-        self.attack_cooldown_timer = 0
+        # Started without the loading screen (benchmarks, scripts)
+        self.wait_for_assets()
         self.current_state = STATE_PLAYING
         
-        # Create player
-        self.player_sprite = PlayerSprite(
-            ":resources:images/animated_characters/female_person/femalePerson",
-            scale=0.4
-        )
-        self.player_sprite.center_x = TILE_SIZE + TILE_SIZE // 2
-        self.player_sprite.center_y = TILE_SIZE + TILE_SIZE // 2
+        # Build the simulation from a pregenerated level when one is ready
+        # (a fixed seed comes from the level cache instead), then mirror it
+        # with sprites
+        level = None
+        if 'seed' not in self.world_options:
+            level = self.pregenerator.take(self.current_map_size, **self.world_options)
+        self.world = World(self.current_map_size, profiler=self.profiler, **self.world_options)
+        if 'seed' in self.world_options:
+            level = self.level_cache.level_for(self.world)
+        self.world.setup(level)
+        if self.recorder:
+            self.recorder.start(self.world)
+        self._update_player_speed()
         
+        # Create player
+        self.player_sprite = PlayerSprite(PLAYER_CHARACTER, scale=0.4)
         self.player_list = arcade.SpriteList()
         self.player_list.append(self.player_sprite)
         
-        # Create border walls
-        self.walls = arcade.SpriteList()
-        self._create_border_walls(map_width, map_height)
-        
-        # Generate maze obstacles
-        wall_positions = MazeGenerator.generate_maze(
-            map_width, map_height,
-            self.player_sprite.center_x,
-            self.player_sprite.center_y
+        # Create walls
+        if STATIC_WALL_LAYER:
+            self.wall_layer.build(self.world.wall_positions, self.world.chunks, (self.width, self.height))
+            self.walls = self.wall_layer.sprite_list
+        else:
+            self.walls = arcade.SpriteList()
+            wall_texture = texture_registry.get_texture(WALL_TEXTURE)
+            wall_xs, wall_ys = self.world.wall_positions
+            for wx, wy in zip(wall_xs.tolist(), wall_ys.tolist()):
+                wall = arcade.Sprite(wall_texture, scale=TILE_SIZE / 128)
+                wall.center_x = wx
+                wall.center_y = wy
+                self.walls.append(wall)
+        
+        # Create coins; they never move, so they are grouped by chunk (one
+        # lookup for all of them) and only the chunks in view are drawn
+        self.coin_chunks = {}
+        self.body_sprites = {}
+        coin_texture = texture_registry.get_texture(COIN_TEXTURE)
+        coin_bodies = self.world.coins
+        cols, rows = self.world.chunks.chunks_of(
+            [body.center_x for body in coin_bodies], [body.center_y for body in coin_bodies]
         )
-        
-        for wx, wy in wall_positions:
-            wall = arcade.Sprite(":resources:images/tiles/grassCenter.png", scale=TILE_SIZE / 128)
-            wall.center_x = wx
-            wall.center_y = wy
-            self.walls.append(wall)
-        
-        # Create coins
-        self.coins = arcade.SpriteList()
-        num_coins = 10 + (len(MAP_SIZES) - list(MAP_SIZES.keys()).index(self.current_map_size)) * 5
-        for _ in range(num_coins):
-            coin = arcade.Sprite(":resources:images/items/coinGold.png", scale=0.5)
-            
-            placed = False
-            attempts = 0
-            while not placed and attempts < 200:
-                coin.center_x = TILE_SIZE + random.random() * (map_width - 2 * TILE_SIZE)
-                coin.center_y = TILE_SIZE + random.random() * (map_height - 2 * TILE_SIZE)
-                
-                hit_wall = arcade.check_for_collision_with_list(coin, self.walls)
-                too_close_to_player = math.hypot(
-                    coin.center_x - self.player_sprite.center_x,
-                    coin.center_y - self.player_sprite.center_y
-                ) < TILE_SIZE * 3
-                
-                if not hit_wall and not too_close_to_player:
-                    placed = True
-                attempts += 1
-            
-            if placed:
-                self.coins.append(coin)
+        for coin_body, chunk in zip(coin_bodies, zip(cols.tolist(), rows.tolist())):
+            coin = arcade.Sprite(coin_texture, scale=0.5)
+            coin.center_x = coin_body.center_x
+            coin.center_y = coin_body.center_y
+            # One SpriteList per chunk, created only when the chunk has none
+            coins = self.coin_chunks.get(chunk)
+            if coins is None:
+                coins = self.coin_chunks[chunk] = arcade.SpriteList()
+            coins.append(coin)
+            self.body_sprites[coin_body] = coin
         
         # Create enemies
         self.enemies = arcade.SpriteList()
-        self.enemy_physics_engines = []
-        
-        num_enemies = 3 + (len(MAP_SIZES) - list(MAP_SIZES.keys()).index(self.current_map_size)) * 2
-        for _ in range(num_enemies):
-            enemy = EnemySprite(":resources:images/animated_characters/zombie/zombie", scale=0.4)
-            
-            placed = False
-            attempts = 0
-            while not placed and attempts < 100:
-                enemy.center_x = TILE_SIZE + random.randint(1, (map_width - 2 * TILE_SIZE) // TILE_SIZE - 1) * TILE_SIZE
-                enemy.center_y = TILE_SIZE + random.randint(1, (map_height - 2 * TILE_SIZE) // TILE_SIZE - 1) * TILE_SIZE
-                
-                hit_wall = arcade.check_for_collision_with_list(enemy, self.walls)
-                too_close_to_player = math.hypot(
-                    enemy.center_x - self.player_sprite.center_x,
-                    enemy.center_y - self.player_sprite.center_y
-                ) < TILE_SIZE * 5
-                
-                if not hit_wall and not too_close_to_player:
-                    placed = True
-                attempts += 1
-            
-            if placed:
-                enemy.health = ENEMY_HEALTH
-                self.enemies.append(enemy)
-                enemy_physics = arcade.PhysicsEngineSimple(enemy, self.walls)
-                self.enemy_physics_engines.append(enemy_physics)
-        
-        # Set up physics engine for player
-        self.physics_engine = arcade.PhysicsEngineSimple(self.player_sprite, self.walls)
-    
-    def _create_border_walls(self, map_width, map_height):
-        """Create border walls around the play area."""
-        # Top and bottom walls
-        for x in range(0, map_width + TILE_SIZE, TILE_SIZE):
-            wall = arcade.Sprite(":resources:images/tiles/grassCenter.png", scale=TILE_SIZE / 128)
-            wall.center_x = x
-            wall.center_y = 0
-            self.walls.append(wall)
-            
-            wall2 = arcade.Sprite(":resources:images/tiles/grassCenter.png", scale=TILE_SIZE / 128)
-            wall2.center_x = x
-            wall2.center_y = map_height
-            self.walls.append(wall2)
-        
-        # Left and right walls
-        for y in range(TILE_SIZE, map_height, TILE_SIZE):
-            wall = arcade.Sprite(":resources:images/tiles/grassCenter.png", scale=TILE_SIZE / 128)
-            wall.center_x = 0
-            wall.center_y = y
-            self.walls.append(wall)
-            
-            wall2 = arcade.Sprite(":resources:images/tiles/grassCenter.png", scale=TILE_SIZE / 128)
-            wall2.center_x = map_width
-            wall2.center_y = y
-            self.walls.append(wall2)
+        self.health_bars.clear()
+        for enemy_body in self.world.enemies:
+            # Staggered walk cycles, so a crowd does not step in lockstep
+            enemy = EnemySprite(ENEMY_CHARACTER, scale=0.4, phase=len(self.enemies))
+            self.enemies.append(enemy)
+            self.body_sprites[enemy_body] = enemy
+            self.health_bars.add(enemy_body)
+        self.animation_codes = np.full(len(self.enemies), -1, dtype=np.intp)
+        
+        self.accumulator = 0.0
+        self._save_previous_state()
+        self._sync_sprites(full=True)
+    
+    def _save_previous_state(self):
+        """Remember positions before a step, to interpolate from."""
+        player = self.world.player
+        enemies = self.world.enemies
+        self.previous_player = (player.center_x, player.center_y)
+        self.previous_enemies = (enemies.x[:enemies.count].copy(), enemies.y[:enemies.count].copy())
+    
+    def _sync_sprites(self, full=False):
+        """
+        Copy simulation state onto the sprites used for drawing.
+        
+        Positions are interpolated between the last two steps by how far
+        the accumulator is into the next one. Only enemies in the active
+        chunks are copied; dormant ones do not move.
+        
+        Args:
+            full: Copy every enemy (new level)
+        """
+        # Drop sprites of collected coins and killed enemies
+        removed = self.world.pop_removed()
+        for body in removed:
+            sprite = self.body_sprites.pop(body, None)
+            if sprite:
+                sprite.remove_from_sprite_lists()
+            self.health_bars.remove(body)
+        if removed:
+            # Removal moves enemies between slots; animate everyone again
+            self.animation_codes[:] = -1
+        
+        alpha = self.accumulator / FIXED_TIMESTEP
+        
+        player = self.world.player
+        previous_x, previous_y = self.previous_player
+        self.player_sprite.center_x = previous_x + (player.center_x - previous_x) * alpha
+        self.player_sprite.center_y = previous_y + (player.center_y - previous_y) * alpha
+        self.player_sprite.change_x = player.change_x
+        self.player_sprite.change_y = player.change_y
+        
+        enemies = self.world.enemies
+        n = enemies.count
+        xs, ys = enemies.x[:n], enemies.y[:n]
+        previous_xs, previous_ys = self.previous_enemies
+        if len(previous_xs) == n:
+            xs = previous_xs + (xs - previous_xs) * alpha
+            ys = previous_ys + (ys - previous_ys) * alpha
+        
+        slots = range(n) if full else self.world.active_slots.tolist()
+        records = enemies.records
+        for slot in slots:
+            enemy_body = records[slot]
+            enemy = self.body_sprites[enemy_body]
+            enemy.center_x = float(xs[slot])
+            enemy.center_y = float(ys[slot])
+        
+        self.health_bars.sync(enemies, xs, ys)
     
     def on_draw(self):
         """Render the screen."""
-        self.clear()
-        
-        if self.current_state == STATE_MENU:
+        with self.profiler.stage('draw'):
+            if self.current_state in STATIC_STATES:
+                cache = self.screen_cache
+                if not cache.valid:
+                    cache.capture(self._draw_state, self.get_framebuffer_size(), self.background_color)
+                cache.draw()
+            else:
+                self.clear()
+                self._draw_state()
+        
+        if self.show_profiler:
+            self._draw_profiler()
+        
+        if 'first_frame' not in self.startup_times:
+            self._startup_reached('first_frame')
+    
+    def _draw_state(self):
+        """Draw the screen of the current state."""
+        if self.current_state == STATE_LOADING:
+            self.menu_renderer.draw_loading(self.asset_loader.progress, "Loading textures")
+        elif self.current_state == STATE_MENU:
             self.menu_renderer.draw_main_menu()
         elif self.current_state == STATE_MAP_SIZE:
             self.menu_renderer.draw_map_size_menu(self.current_map_size)
         elif self.current_state == STATE_SETTINGS:
             self.menu_renderer.draw_settings()
         elif self.current_state == STATE_HIGHSCORE:
-            self.menu_renderer.draw_highscores(self.highscore_manager.get_top_scores())
+            entries, pages = self.highscore_entries
+            self.menu_renderer.draw_highscores(
+                entries, self.highscore_map_size, self.highscore_page, pages, LEADERBOARD_PAGE_SIZE
+            )
         elif self.current_state == STATE_PLAYING:
             self._draw_game()
         elif self.current_state == STATE_PAUSED:
@@ -200,23 +359,73 @@ class DungeonCrawler(arcade.Window):
             self.menu_renderer.draw_pause_overlay()
         elif self.current_state == STATE_GAME_OVER:
             self._draw_game()
-            is_high_score = self.highscore_manager.is_high_score(self.score)
-            self.menu_renderer.draw_game_over(self.player_health, self.score, is_high_score)
+            rank, percentile = self.game_over_rank
+            self.menu_renderer.draw_game_over(
+                self.world.player_health, self.world.score, rank, percentile, self.world.map_size
+            )
     
     def _draw_game(self):
         """Draw the game screen."""
-        if self.walls:
-            self.walls.draw()
-        if self.coins:
-            self.coins.draw()
-        if self.enemies:
-            self.enemies.draw()
-        if self.player_list:
-            self.player_list.draw()
-        
-        # Draw HUD
-        arcade.draw_text(
-            f"Score: {self.score}",
+        if not self.world:
+            return
+        visible = self._update_camera()
+        
+        profiler = self.profiler
+        with self.camera.activate():
+            with profiler.stage('draw_walls'):
+                if self.walls:
+                    self.walls.draw()
+            with profiler.stage('draw_sprites'):
+                for chunk in visible:
+                    coins = self.coin_chunks.get(chunk)
+                    if coins:
+                        coins.draw()
+                if self.enemies:
+                    self.enemies.draw()
+                if self.player_list:
+                    self.player_list.draw()
+            
+            # Draw enemy health bars
+            with profiler.stage('draw_health_bars'):
+                self.health_bars.draw()
+        
+        with profiler.stage('draw_hud'):
+            self._draw_hud()
+    
+    def _update_camera(self):
+        """
+        Center the camera on the player without showing past the map edges.
+        
+        Returns:
+            Chunks in view
+        """
+        map_width, map_height = MAP_SIZES[self.current_map_size]
+        half_w, half_h = self.width / 2, self.height / 2
+        
+        # Maps smaller than the window are centered
+        x, y = self.player_sprite.center_x, self.player_sprite.center_y
+        x = min(max(x, half_w), map_width - half_w) if map_width > self.width else map_width / 2
+        y = min(max(y, half_h), map_height - half_h) if map_height > self.height else map_height / 2
+        self.camera.position = (x, y)
+        
+        chunks = self.world.chunks
+        visible = chunks.chunks_in_rect(x - half_w, y - half_h, x + half_w, y + half_h)
+        if STATIC_WALL_LAYER:
+            self.wall_layer.show(x - half_w, y - half_h, x + half_w, y + half_h)
+        return visible
+    
+    def on_resize(self, width, height):
+        """Keep the game camera matching the window."""
+        super().on_resize(width, height)
+        self.camera.match_window()
+        self.screen_cache.invalidate()
+    
+    def _draw_hud(self):
+        """Draw score, health and cooldown."""
+        world = self.world
+        self.hud_texts.text(
+            "score",
+            f"Score: {world.score}",
             10, self.height - 30,
             arcade.color.WHITE,
             24,
@@ -225,13 +434,14 @@ class DungeonCrawler(arcade.Window):
         
         # Draw health with color coding
         health_color = arcade.color.GREEN
-        if self.player_health < 50:
+        if world.player_health < 50:
             health_color = arcade.color.ORANGE
-        if self.player_health < 25:
+        if world.player_health < 25:
             health_color = arcade.color.RED
         
-        arcade.draw_text(
-            f"Health: {int(self.player_health)}",
+        self.hud_texts.text(
+            "health",
+            f"Health: {int(world.player_health)}",
             10, self.height - 60,
             health_color,
             20,
@@ -239,34 +449,74 @@ class DungeonCrawler(arcade.Window):
         )
         
         # Draw attack cooldown indicator
-        if self.attack_cooldown_timer > 0:
-            arcade.draw_text(
+        if world.attack_cooldown_timer > 0:
+            self.hud_texts.text(
+                "cooldown",
                 "Cooldown...",
                 10, self.height - 90,
                 arcade.color.YELLOW,
                 16
             )
-        
-        # Draw enemy health bars
-        for enemy in self.enemies:
-            if hasattr(enemy, 'health'):
-                bar_width = 40
-                bar_height = 5
-                health_percentage = enemy.health / ENEMY_HEALTH
-                
-                left = enemy.center_x - bar_width / 2
-                right = enemy.center_x + bar_width / 2
-                bottom = enemy.center_y + 40 - bar_height / 2
-                top = enemy.center_y + 40 + bar_height / 2
-                
-                # Background (red)
-                arcade.draw_lrbt_rectangle_filled(left, right, bottom, top, arcade.color.RED)
-                # Health (green)
-                right = left + bar_width * health_percentage
-                arcade.draw_lrbt_rectangle_filled(left, right, bottom, top, arcade.color.GREEN)
+        self.hud_texts.draw()
+    
+    def _draw_profiler(self):
+        """Draw the p50/p95/p99 overlay, refreshing the numbers every 30 frames."""
+        if self.profiler_frames % 30 == 0:
+            self.profiler_lines = [
+                f"{name}: p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f} ms"
+                for name, stats in self.profiler.summary().items()
+            ] + self._profiler_counters()
+        self.profiler_frames += 1
+        
+        top = self.height - 10
+        arcade.draw_lrbt_rectangle_filled(
+            self.width - 330, self.width,
+            top - 18 * len(self.profiler_lines) - 10, self.height,
+            (0, 0, 0, 160)
+        )
+        for i, line in enumerate(self.profiler_lines):
+            self.profiler_texts.text(
+                ("stage", i),
+                line,
+                self.width - 10, top - 18 * (i + 1),
+                arcade.color.WHITE,
+                11,
+                anchor_x="right"
+            )
+        self.profiler_texts.draw()
+    
+    def _profiler_counters(self):
+        """Work counters listed under the stage timings of the F3 overlay."""
+        lines = []
+        world = self.world
+        if world:
+            lines.append(f"flow field rebuilds (level): {world.flow_field.rebuilds}")
+        menu_layouts = sum(texts.layouts for texts in self.menu_renderer.screens.values())
+        lines.append(f"text layouts: HUD {self.hud_texts.layouts}, menus {menu_layouts}")
+        lines.append(f"health bar updates: {self.health_bars.updates}")
+        textures = texture_registry.stats()
+        lines.append(f"textures: {textures['hits']} hits, {textures['misses']} loaded from disk")
+        if STATIC_WALL_LAYER:
+            layer = self.wall_layer
+            lines.append(f"wall chunk bakes: {layer.bakes} ({layer.wall_count} walls)")
+        if self.pregenerator:
+            pregen = self.pregenerator
+            lines.append(f"pregenerated levels: {pregen.hits} used, {pregen.misses} not ready")
+        if self.level_cache:
+            cache = self.level_cache
+            lines.append(f"level cache: {cache.hits} hits, {cache.misses} misses")
+        lines.append(f"static screen captures: {self.screen_cache.captures}")
+        return lines
     
     def on_key_press(self, key, modifiers):
         """Handle key presses for menus, movement, and combat."""
+        # Any key may change what a static screen shows
+        self.screen_cache.invalidate()
+        if key == arcade.key.F3:
+            self.show_profiler = not self.show_profiler
+            self.profiler_frames = 0
+            return
+        
         if self.current_state == STATE_MENU:
             if key == arcade.key.ENTER:
                 self.setup()
@@ -276,25 +526,36 @@ class DungeonCrawler(arcade.Window):
                 self.current_state = STATE_SETTINGS
             elif key == arcade.key.H:
                 self.current_state = STATE_HIGHSCORE
+                self._show_highscores(self.current_map_size, 0)
             elif key == arcade.key.ESCAPE:
                 arcade.exit()
         
         elif self.current_state == STATE_MAP_SIZE:
-            if key == arcade.key.KEY_1:
-                self.current_map_size = 'small'
-            elif key == arcade.key.KEY_2:
-                self.current_map_size = 'medium'
-            elif key == arcade.key.KEY_3:
-                self.current_map_size = 'large'
-            elif key == arcade.key.KEY_4:
-                self.current_map_size = 'huge'
+            sizes = list(MAP_SIZES)
+            if arcade.key.KEY_1 <= key < arcade.key.KEY_1 + len(sizes):
+                self.current_map_size = sizes[key - arcade.key.KEY_1]
+                self._prefetch_levels()
             elif key == arcade.key.ESCAPE:
                 self.current_state = STATE_MENU
         
-        elif self.current_state in (STATE_SETTINGS, STATE_HIGHSCORE):
+        elif self.current_state == STATE_SETTINGS:
             if key == arcade.key.ESCAPE:
                 self.current_state = STATE_MENU
         
+        elif self.current_state == STATE_HIGHSCORE:
+            sizes = list(MAP_SIZES)
+            pages = self.highscore_entries[1]
+            if arcade.key.KEY_1 <= key < arcade.key.KEY_1 + len(sizes):
+                self._show_highscores(sizes[key - arcade.key.KEY_1], 0)
+            elif key == arcade.key.KEY_0:
+                self._show_highscores(None, 0)
+            elif key == arcade.key.RIGHT and self.highscore_page + 1 < pages:
+                self._show_highscores(self.highscore_map_size, self.highscore_page + 1)
+            elif key == arcade.key.LEFT and self.highscore_page > 0:
+                self._show_highscores(self.highscore_map_size, self.highscore_page - 1)
+            elif key == arcade.key.ESCAPE:
+                self.current_state = STATE_MENU
+        
         elif self.current_state == STATE_PLAYING:
             if key in (arcade.key.P, arcade.key.ESCAPE):
                 self.current_state = STATE_PAUSED
@@ -316,7 +577,7 @@ class DungeonCrawler(arcade.Window):
                 self.current_state = STATE_PLAYING
             elif key == arcade.key.Q:
                 # Save score before quitting
-                self.highscore_manager.add_score(self.score)
+                self._record_score()
                 self.current_state = STATE_MENU
         
         elif self.current_state == STATE_GAME_OVER:
@@ -325,34 +586,58 @@ class DungeonCrawler(arcade.Window):
             elif key == arcade.key.ESCAPE:
                 self.current_state = STATE_MENU
     
+    def _show_highscores(self, map_size, page):
+        """Load one page of the leaderboard for the highscore screen (shown when it arrives)."""
+        self.highscore_map_size = map_size
+        self.highscore_page = page
+        self.page_query = self.highscore_manager.request_page(map_size, page, LEADERBOARD_PAGE_SIZE)
+    
+    def _collect_queries(self):
+        """Store the results of finished leaderboard queries and redraw their screens."""
+        if self.page_query and self.page_query.done():
+            self.highscore_entries = self._query_result(self.page_query, ([], 1))
+            self.page_query = None
+            self.screen_cache.invalidate()
+        if self.standing_query and self.standing_query.done():
+            self.game_over_rank = self._query_result(self.standing_query, (None, None))
+            self.standing_query = None
+            self.screen_cache.invalidate()
+    
+    @staticmethod
+    def _query_result(future, default):
+        """Result of a finished leaderboard query, or default if the database failed."""
+        error = future.exception()
+        if error is not None:
+            print(f"Warning: Could not read highscores: {error}")
+            return default
+        return future.result()
+    
+    def _record_score(self):
+        """Queue the current game's score for the leaderboard."""
+        world = self.world
+        self.highscore_manager.add_score(world.score, world.map_size, world.seed, world.elapsed)
+    
+    def _prefetch_levels(self):
+        """Start generating levels for the selected map size."""
+        if self.pregenerator and 'seed' not in self.world_options:
+            self.pregenerator.prefetch(self.current_map_size, **self.world_options)
+    
+    def close(self):
+        """Stop the level workers and flush highscores along with the window (safe to call twice)."""
+        if self.pregenerator:
+            self.pregenerator.shutdown()
+            self.pregenerator = None
+        if self.highscore_manager:
+            self.highscore_manager.close()
+            self.highscore_manager = None
+        super().close()
+    
     def _attack(self):
         """Player attacks nearby enemies."""
-        if self.attack_cooldown_timer > 0:
-            return
-        
-        self.attack_cooldown_timer = ATTACK_COOLDOWN
-        
-        attack_range = TILE_SIZE * 1.5
-        enemies_to_remove = []
-        
-        for enemy in self.enemies:
-            distance = math.hypot(
-                self.player_sprite.center_x - enemy.center_x,
-                self.player_sprite.center_y - enemy.center_y
-            )
-            
-            if distance < attack_range:
-                enemy.health -= ATTACK_DAMAGE
-                if enemy.health <= 0:
-                    enemies_to_remove.append(enemy)
-                    self.score += 50
-        
-        for enemy in enemies_to_remove:
-            enemy.remove_from_sprite_lists()
-            if enemy in self.enemies:
-                idx = list(self.enemies).index(enemy)
-                if idx < len(self.enemy_physics_engines):
-                    self.enemy_physics_engines.pop(idx)
+        self.world.attack()
+        # Killed enemies' slots were refilled, so old positions no longer line up
+        self._save_previous_state()
+        self._sync_sprites()
     
     def on_key_release(self, key, modifiers):
         """Handle key releases."""
@@ -371,95 +656,159 @@ class DungeonCrawler(arcade.Window):
         self._update_player_speed()
     
     def _update_player_speed(self):
-        """Update player velocity with normalized diagonal speed."""
-        self.player_sprite.change_x = 0
-        self.player_sprite.change_y = 0
-        
-        if self.up_pressed:
-            self.player_sprite.change_y += PLAYER_SPEED
-        if self.down_pressed:
-            self.player_sprite.change_y -= PLAYER_SPEED
-        if self.left_pressed:
-            self.player_sprite.change_x -= PLAYER_SPEED
-        if self.right_pressed:
-            self.player_sprite.change_x += PLAYER_SPEED
-        
-        # Normalize diagonal movement
-        if self.player_sprite.change_x != 0 and self.player_sprite.change_y != 0:
-            magnitude = math.sqrt(
-                self.player_sprite.change_x ** 2 + 
-                self.player_sprite.change_y ** 2
-            )
-            self.player_sprite.change_x = (self.player_sprite.change_x / magnitude) * PLAYER_SPEED
-            self.player_sprite.change_y = (self.player_sprite.change_y / magnitude) * PLAYER_SPEED
+        """Forward the held direction keys to the simulation."""
+        dx = int(self.right_pressed) - int(self.left_pressed)
+        dy = int(self.up_pressed) - int(self.down_pressed)
+        self.world.set_movement(dx, dy)
     
     def on_update(self, delta_time):
         """Movement and game logic."""
+        if self.current_state == STATE_LOADING:
+            self._update_loading()
+            return
+        if self.page_query or self.standing_query:
+            self._collect_queries()
         if self.current_state != STATE_PLAYING:
             return
         
-        # Update attack cooldown
-        if self.attack_cooldown_timer > 0:
-            self.attack_cooldown_timer -= delta_time
-        
-        # Update physics
-        if self.physics_engine:
-            self.physics_engine.update()
-        
-        # Update animations
-        if self.player_list:
-            self.player_list.update_animation(delta_time)
-        if self.enemies:
-            self.enemies.update_animation(delta_time)
-        
-        # Update coins
-        if self.coins:
-            self.coins.update()
-        
-        # Enemy AI: chase player
-        for i, enemy in enumerate(self.enemies):
-            dx = self.player_sprite.center_x - enemy.center_x
-            dy = self.player_sprite.center_y - enemy.center_y
-            distance = math.hypot(dx, dy)
-            
-            if distance > 0:
-                enemy.change_x = (dx / distance) * ENEMY_SPEED
-                enemy.change_y = (dy / distance) * ENEMY_SPEED
+        profiler = self.profiler
+        with profiler.stage('update'):
+            # Run whole fixed steps for the elapsed time; past the cap the
+            # backlog is dropped so a slow frame cannot snowball
+            self.accumulator += delta_time
+            steps = 0
+            while self.accumulator >= FIXED_TIMESTEP and not self.world.game_over:
+                if steps == MAX_STEPS_PER_FRAME:
+                    self.accumulator %= FIXED_TIMESTEP
+                    break
+                self._save_previous_state()
+                self.world.step(FIXED_TIMESTEP)
+                self.accumulator -= FIXED_TIMESTEP
+                steps += 1
             
-            if i < len(self.enemy_physics_engines):
-                self.enemy_physics_engines[i].update()
-        
-        self.enemies.update()
-        
-        # Coin collection
-        coin_hit_list = arcade.check_for_collision_with_list(self.player_sprite, self.coins)
-        for coin in coin_hit_list:
-            coin.remove_from_sprite_lists()
-            self.score += 10
-        
-        # Enemy collision damage
-        enemy_hit_list = arcade.check_for_collision_with_list(self.player_sprite, self.enemies)
-        if enemy_hit_list:
-            self.player_health -= 5 * delta_time * len(enemy_hit_list)
+            with profiler.stage('sync'):
+                self._sync_sprites()
             
-            if self.player_health <= 0:
-                self.player_health = 0
-                self._game_over()
+            # Update animations
+            with profiler.stage('animation'):
+                self._update_animations(delta_time)
         
-        # Win condition
-        if len(self.coins) == 0:
-            self._game_over(won=True)
+        if self.world.game_over:
+            self._game_over(won=self.world.won)
+    
+    def _update_loading(self):
+        """Open the menu once the background loading is done and a frame was drawn."""
+        # Loading can finish before the first on_draw; keep the loading
+        # screen until then, so every startup timing gets recorded
+        if 'first_frame' not in self.startup_times or not self.asset_loader.done():
+            return
+        self._finish_loading()
+        self._startup_reached('playable')
+        print(
+            f"Startup: imports {self.startup_times['imports'] * 1000:.0f} ms, "
+            f"first frame {self.startup_times['first_frame'] * 1000:.0f} ms, "
+            f"playable {self.startup_times['playable'] * 1000:.0f} ms"
+        )
+        if self.exit_when_playable:
+            # Closing the window also ends the headless loop, unlike arcade.exit()
+            self.close()
+            return
+        # Worker processes start only now, so they do not compete with loading
+        self._prefetch_levels()
+    
+    def _update_animations(self, delta_time):
+        """
+        Advance the animation clock and re-texture sprites that need it.
+        
+        Enemy directions come straight from the store's velocity arrays;
+        only enemies whose direction changed, or every walking one when the
+        clock moves to the next walk frame, are touched.
+        """
+        ticked = animation_clock.advance(delta_time)
+        self.player_list.update_animation(delta_time)
+        
+        enemies = self.world.enemies
+        slots = self.world.active_slots
+        codes = direction_codes(enemies.change_x[slots], enemies.change_y[slots])
+        changed = codes != self.animation_codes[slots]
+        if ticked:
+            changed |= codes != IDLE_CODE
+        self.animation_codes[slots] = codes
+        
+        records = enemies.records
+        body_sprites = self.body_sprites
+        for slot, code in zip(slots[changed].tolist(), codes[changed].tolist()):
+            body_sprites[records[slot]].animate(code)
     
     def _game_over(self, won=False):
         """Handle game over state."""
-        self.highscore_manager.add_score(self.score)
+        # Ranked before the score itself is stored; requests and writes
+        # run in order on the writer thread
+        score, map_size = self.world.score, self.world.map_size
+        self.game_over_rank = (None, None)
+        self.standing_query = self.highscore_manager.request_standing(score, map_size)
+        self._record_score()
         self.current_state = STATE_GAME_OVER
 
 
+def run_replay(filename):
+    """Play every game in a recording back at full speed and report the results."""
+    from game.replay import load_recordings, replay
+    
+    profiler = FrameProfiler(PROFILE_HISTORY)
+    for i, recording in enumerate(load_recordings(filename)):
+        start = time.perf_counter()
+        world = replay(recording, profiler)
+        elapsed = time.perf_counter() - start
+        ticks = len(recording.ticks)
+        print(
+            f"Game {i + 1}: {recording.map_size} ({recording.algorithm} maze), seed {recording.seed}, {ticks} ticks "
+            f"in {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s) - "
+            f"score {world.score}, health {world.player_health:.1f}, "
+            f"{'won' if world.won else 'lost' if world.game_over else 'unfinished'}"
+        )
+    for name, stats in profiler.summary().items():
+        print(f"  {name}: p50 {stats['p50']:.3f}  p95 {stats['p95']:.3f}  p99 {stats['p99']:.3f} ms")
+
+
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument('--seed', type=int, help="Play the level generated from this seed")
+    parser.add_argument('--maze', choices=MazeGenerator.ALGORITHMS, default=MAZE_ALGORITHM,
+                        help="Maze generation algorithm")
+    parser.add_argument('--record', metavar='FILE', help="Record every game's input to FILE")
+    parser.add_argument('--replay', metavar='FILE', help="Replay a recording at full speed, without a window")
+    parser.add_argument('--time-startup', action='store_true',
+                        help="Quit once the game is playable and print the startup timings as JSON")
+    args = parser.parse_args()
+    
+    if args.replay:
+        run_replay(args.replay)
+        return
+    
     window = DungeonCrawler()
+    window.world_options['algorithm'] = args.maze
+    if args.seed is not None:
+        window.world_options['seed'] = args.seed
+    if args.record:
+        from game.replay import InputRecorder
+        window.recorder = InputRecorder(args.record)
+    window.exit_when_playable = args.time_startup
     arcade.run()
+    # arcade.exit() (ESC in the menu) ends the loop without closing the
+    # window; close it so queued highscores are written
+    window.close()
+    
+    if args.time_startup:
+        print(json.dumps({name: seconds * 1000 for name, seconds in window.startup_times.items()}))
+    
+    if window.recorder:
+        window.recorder.close()
+    
+    # Keep the frame timings of this session for offline analysis
+    if PROFILE_EXPORT and window.profiler.stages:
+        window.profiler.dump(PROFILE_EXPORT)
 
 
 if __name__ == "__main__":